@@ -14,14 +14,24 @@ setup(
     author_email='conrad@mukai-home.net',
     url="https://github.com/conrad-mukai/sim21",
     packages=['sim21', 'sim21.strategies'],
+    package_data={
+        'sim21.strategies': ['charts/*.json', 'deviations/*.json']
+    },
     install_requires=[
         'jsonschema',
         'tabulate',
         'tqdm'
     ],
+    extras_require={
+        'batch': ['numpy']
+    },
     entry_points={
         'console_scripts': [
-            'sim21=sim21:main'
+            'sim21=sim21:main',
+            'sim21-edge=sim21.edge:main',
+            'sim21-bench=sim21.bench:main',
+            'sim21-indices=sim21.indices:main',
+            'sim21-chart=sim21.chartgen:main'
         ]
     }
 )
@@ -0,0 +1,375 @@
+"""
+Lockstep batch engine. Many independent simulations are played at once, one
+table per simulation, with the shoes, hands and bankrolls of all tables held
+in NumPy arrays and every decision made by masked lookups into the chart
+tables. Only table-driven strategies are supported.
+
+The shoes are shuffled lazily as in Shoe: every card dealt is drawn, for all
+the tables at once, from the cards not dealt yet, and a reshuffle costs
+nothing. Every table draws from its own NumPy Generator seeded from the
+simulation index, a block of draws at a time, so a simulation deals the same
+cards whatever the batch it is played in. The tables play by the same rules
+as Game, so a simulation gives the same statistics in either engine up to the
+sampling error, but not the same cards.
+"""
+
+# 3rd party imports
+import numpy as np
+
+# project imports
+from .config import PLAYER_STRATEGIES_KEY, STRATEGY_BETTING_KEY, \
+    STRATEGY_PLAYING_KEY, GAME_SURRENDER_EARLY, GAME_SURRENDER_LATE
+from .context import GameContext
+from .game import dealer_strategy, blackjack_multiplier
+from .hand import EMPTY, TRANSITION, SCORE, SOFT, BUSTED, BLACKJACK, PAIR
+from .players import create_strategy, player_bankroll
+from .rng import simulation_seed
+from .shoe import ACE, Card, Deck
+from .stats import PlayerStats, _StrategyStats
+from .strategies import ConstantBettingStrategy, Soft17
+from .strategies.chart import strategy_tables
+
+# constants
+_TRANSITION = np.array(TRANSITION, dtype=np.int32)
+_SCORE = np.array(SCORE, dtype=np.int32)
+_SOFT = np.array(SOFT, dtype=bool)
+_BUSTED = np.array(BUSTED, dtype=bool)
+_BLACKJACK = np.array(BLACKJACK, dtype=bool)
+_PAIR = np.array(PAIR, dtype=np.int32)
+_HANDS_DEFAULT = 4
+_DRAWS = 256    # draws generated at once for a table
+_STATS = ('games', 'wins', 'loses', 'pushes', 'blackjacks', 'doubles',
+          'splits', 'surrenders', 'game_squares', 'hand_squares')
+
+
+def _wager(strategy):
+    if strategy.__class__ is not ConstantBettingStrategy:
+        raise ValueError("betting strategy not supported by batch engine: %s"
+                         % strategy.__class__.__name__)
+    return strategy.wager
+
+
+class _Seat(object):
+
+    def __init__(self, player_config, context):
+        strategies = player_config[PLAYER_STRATEGIES_KEY]
+        betting_strategy = create_strategy(strategies[STRATEGY_BETTING_KEY])
+        playing_strategy = create_strategy(strategies[STRATEGY_PLAYING_KEY])
+        betting_strategy.bind(context)
+        self.id = PlayerStats(betting_strategy, playing_strategy, None).id
+        self.wager = _wager(betting_strategy)
+        self.bankroll = player_bankroll(player_config,
+                                        context.config.minimum)
+        tables = strategy_tables(playing_strategy)
+        self.hit = np.array(tables.hit, dtype=bool)
+        self.doubledown = np.array(tables.doubledown, dtype=bool)
+        self.split = np.array(tables.split, dtype=bool)
+        self.surrender = np.array(tables.surrender, dtype=bool)
+
+
+class BatchGame(object):
+
+    def __init__(self, config, seed, indices):
+        self.config = config
+        context = GameContext(config)
+        self.seats = [_Seat(c, context) for c in config.player_configs()]
+        self.soft17 = isinstance(dealer_strategy(config), Soft17)
+        multiplier = blackjack_multiplier(config)
+        self.blackjack_num = multiplier.num
+        self.blackjack_den = multiplier.den
+        ntables = len(indices)
+        nseats = len(self.seats)
+        nhands = config.maxhands or _HANDS_DEFAULT
+        self.ntables = ntables
+        self.ncards = config.shoe * Card.nvalues
+        self.rngs = [np.random.default_rng(
+                         np.random.SeedSequence(simulation_seed(seed, i)))
+                     for i in indices]
+        self.draws = np.zeros((ntables, _DRAWS))
+        self.drawn = np.full(ntables, _DRAWS, dtype=np.int64)
+        self.shoes = np.tile(np.array(config.shoe * Deck.values,
+                                      dtype=np.int8), (ntables, 1))
+        self.pointer = np.zeros(ntables, dtype=np.int64)
+        self.initial = np.array([s.bankroll for s in self.seats],
+                                dtype=np.int64)
+        self.bankroll = np.tile(self.initial, (ntables, 1))
+        self.start = np.zeros((ntables, nseats), dtype=np.int64)
+        self.wager = np.zeros((ntables, nseats, nhands), dtype=np.int64)
+        self.state = np.zeros((ntables, nseats, nhands), dtype=np.int32)
+        self.live = np.zeros((ntables, nseats, nhands), dtype=bool)
+        self.order = np.zeros((ntables, nseats, nhands), dtype=np.int32)
+        self.nhands = np.zeros((ntables, nseats), dtype=np.int32)
+        self.hand_count = np.zeros((ntables, nseats), dtype=np.int32)
+        self.split_game = np.zeros((ntables, nseats), dtype=bool)
+        self.split_card = np.zeros((ntables, nseats), dtype=np.int32)
+        self.dealer = np.zeros(ntables, dtype=np.int32)
+        self.upcard = np.zeros(ntables, dtype=np.int32)
+        self.stats = {k: np.zeros((ntables, nseats), dtype=np.int64)
+                      for k in _STATS}
+
+    def play(self, ngame):
+        active = np.ones(self.ntables, dtype=bool)
+        self._shuffle(np.arange(self.ntables))
+        for _ in range(ngame):
+            tables = np.nonzero(active)[0]
+            if len(tables) == 0:
+                break
+            self._reshuffle(tables)
+            self._place_bets(tables)
+            self._deal(tables)
+            playing = self._surrender(tables)
+            playing = self._player_hands(playing)
+            playing = self._dealer_hand(playing)
+            self._show_hands(playing)
+            outcome = self.bankroll[tables] - self.start[tables]
+            self.stats['game_squares'][tables] += outcome * outcome
+            active[tables] = (self.bankroll[tables]
+                              >= self.config.minimum).any(axis=1)
+
+    def payload(self):
+        payload = {}
+        for s, seat in enumerate(self.seats):
+            stats = payload.setdefault(seat.id, _StrategyStats())
+            for k in _STATS:
+                setattr(stats, k,
+                        getattr(stats, k) + int(self.stats[k][:, s].sum()))
+            stats.outcome += int((self.bankroll[:, s]
+                                  - self.initial[s]).sum())
+        return payload, {}, {}
+
+    def _shuffle(self, tables):
+        # the cards are shuffled as they are dealt
+        self.pointer[tables] = 0
+
+    def _reshuffle(self, tables):
+        position = self.pointer[tables] / self.ncards
+        self._shuffle(tables[position > self.config.reshuffle])
+
+    def _draw(self, tables):
+        # a random card of those not dealt yet takes the place of the next
+        for t in tables[self.drawn[tables] == _DRAWS]:
+            self.draws[t] = self.rngs[t].random(_DRAWS)
+            self.drawn[t] = 0
+        draws = self.draws[tables, self.drawn[tables]]
+        self.drawn[tables] += 1
+        pointer = self.pointer[tables]
+        left = self.ncards - pointer
+        drawn = pointer + np.minimum((draws * left).astype(np.int64),
+                                     left - 1)
+        cards = self.shoes[tables, drawn]
+        self.shoes[tables, drawn] = self.shoes[tables, pointer]
+        self.shoes[tables, pointer] = cards
+        self.pointer[tables] = pointer + 1
+        return cards.astype(np.int32)
+
+    def _receive(self, tables, s, h):
+        cards = self._draw(tables)
+        self.state[tables, s, h] = _TRANSITION[self.state[tables, s, h]
+                                               + cards]
+
+    def _place_bets(self, tables):
+        bankroll = self.bankroll[tables]
+        self.start[tables] = bankroll
+        bankrolled = bankroll >= self.config.minimum
+        wagers = np.array([s.wager for s in self.seats], dtype=np.int64)
+        wager = np.where(bankroll > wagers, wagers, bankroll) * bankrolled
+        self.bankroll[tables] -= wager
+        self.stats['games'][tables] += bankrolled
+        self.wager[tables] = 0
+        self.wager[tables, :, 0] = wager
+        self.state[tables] = EMPTY
+        self.live[tables] = False
+        self.live[tables, :, 0] = bankrolled
+        self.order[tables] = -1
+        self.nhands[tables] = 1
+        self.hand_count[tables] = 1
+        self.split_game[tables] = False
+        self.split_card[tables] = 0
+        self.dealer[tables] = EMPTY
+
+    def _deal(self, tables):
+        for deal in range(2):
+            for s in range(len(self.seats)):
+                self._receive(tables[self.live[tables, s, 0]], s, 0)
+            cards = self._draw(tables)
+            if deal == 0:
+                self.upcard[tables] = cards
+            self.dealer[tables] = _TRANSITION[self.dealer[tables] + cards]
+
+    def _surrender(self, tables):
+        surrender_policy = self.config.surrender
+        if surrender_policy == GAME_SURRENDER_EARLY:
+            self._player_surrender(tables)
+        elif surrender_policy == GAME_SURRENDER_LATE:
+            blackjack = _BLACKJACK[self.dealer[tables]]
+            self._dealer_blackjack(tables[blackjack])
+            self._player_surrender(tables[~blackjack])
+        else:
+            return tables
+        return self._playing(tables)
+
+    def _player_surrender(self, tables):
+        for s, seat in enumerate(self.seats):
+            t = tables[self.live[tables, s, 0]]
+            t = t[seat.surrender[self.state[t, s, 0] + self.upcard[t]]]
+            self.wager[t, s, 0] >>= 1
+            self.bankroll[t, s] += self.wager[t, s, 0]
+            self.stats['surrenders'][t, s] += 1
+            self._lose(t, s, 0)
+
+    def _player_hands(self, tables):
+        for s, seat in enumerate(self.seats):
+            t = tables[self.live[tables, s, 0]]
+            h = np.zeros(len(t), dtype=np.int32)
+            first = np.ones(len(t), dtype=bool)
+            while len(t):
+                done = self._play_step(seat, s, t, h, first)
+                h[done] = self.order[t[done], s, h[done]]
+                first[done] = True
+                keep = h >= 0
+                t, h, first = t[keep], h[keep], first[keep]
+        return self._playing(tables)
+
+    def _play_step(self, seat, s, t, h, first):
+        index = self.state[t, s, h] + self.upcard[t]
+        wager = self.wager[t, s, h]
+        funded = self.bankroll[t, s] >= wager
+        doubledown = first & funded & seat.doubledown[index]
+        if not self.config.DAS:
+            doubledown &= ~self.split_game[t, s]
+        self._doubledown(t[doubledown], s, h[doubledown])
+        split = first & ~doubledown & funded & seat.split[index] \
+            & (_PAIR[self.state[t, s, h]] != 0) \
+            & (self.hand_count[t, s] != self.config.maxhands)
+        self._split(t[split], s, h[split])
+        play = ~doubledown & ~split
+        first[play] = False
+        hit = play & seat.hit[index] \
+            & ~(self.split_game[t, s] & (self.split_card[t, s] == ACE))
+        self._hit(t[hit], s, h[hit])
+        return doubledown | (play & ~hit) | (hit & ~self.live[t, s, h])
+
+    def _doubledown(self, t, s, h):
+        self.bankroll[t, s] -= self.wager[t, s, h]
+        self.wager[t, s, h] <<= 1
+        self.stats['doubles'][t, s] += 1
+        self._receive(t, s, h)
+        self._busted(t, s, h)
+
+    def _split(self, t, s, h):
+        if len(t) == 0:
+            return
+        self.hand_count[t, s] += 1
+        self.stats['splits'][t, s] += 1
+        n = self.nhands[t, s]
+        if n.max() >= self.wager.shape[2]:
+            self._grow()
+        self.nhands[t, s] += 1
+        card = _PAIR[self.state[t, s, h]]
+        self.state[t, s, h] = _TRANSITION[EMPTY + card]
+        self.state[t, s, n] = _TRANSITION[EMPTY + card]
+        self.wager[t, s, n] = self.wager[t, s, h]
+        self.bankroll[t, s] -= self.wager[t, s, h]
+        self.live[t, s, n] = True
+        self.split_game[t, s] = True
+        self.split_card[t, s] = card
+        self._receive(t, s, h)
+        self._receive(t, s, n)
+        self.order[t, s, n] = self.order[t, s, h]
+        self.order[t, s, h] = n
+
+    def _hit(self, t, s, h):
+        self._receive(t, s, h)
+        self._busted(t, s, h)
+
+    def _busted(self, t, s, h):
+        busted = _BUSTED[self.state[t, s, h]]
+        self._lose(t[busted], s, h[busted])
+
+    def _grow(self):
+        for name in ('wager', 'state', 'live', 'order'):
+            a = getattr(self, name)
+            setattr(self, name, np.concatenate((a, np.zeros_like(a)), axis=2))
+
+    def _dealer_hand(self, tables):
+        standing = []
+        while len(tables):
+            state = self.dealer[tables]
+            score = _SCORE[state]
+            hit = score < 17
+            if self.soft17:
+                hit |= (score == 17) & _SOFT[state]
+            standing.append(tables[~hit])
+            tables = tables[hit]
+            self.dealer[tables] = _TRANSITION[self.dealer[tables]
+                                              + self._draw(tables)]
+            busted = _BUSTED[self.dealer[tables]]
+            self._each_hand(tables[busted], self._win)
+            tables = tables[~busted]
+        return np.concatenate(standing) if standing \
+            else np.zeros(0, dtype=np.int64)
+
+    def _show_hands(self, tables):
+        blackjack = _BLACKJACK[self.dealer[tables]]
+        self._dealer_blackjack(tables[blackjack])
+        tables = tables[~blackjack]
+        self._each_hand(tables, self._showdown)
+
+    def _showdown(self, t, s, h):
+        blackjack = _BLACKJACK[self.state[t, s, h]] & ~self.split_game[t, s]
+        self.stats['blackjacks'][t[blackjack], s] += 1
+        self._win(t[blackjack], s, h[blackjack], self.blackjack_num,
+                  self.blackjack_den)
+        t, h = t[~blackjack], h[~blackjack]
+        player_score = _SCORE[self.state[t, s, h]]
+        dealer_score = _SCORE[self.dealer[t]]
+        lose = player_score < dealer_score
+        win = player_score > dealer_score
+        push = ~lose & ~win
+        self._lose(t[lose], s, h[lose])
+        self._win(t[win], s, h[win])
+        self._push(t[push], s, h[push])
+
+    def _dealer_blackjack(self, tables):
+        self._each_hand(tables, self._blackjack_showdown)
+
+    def _blackjack_showdown(self, t, s, h):
+        blackjack = _BLACKJACK[self.state[t, s, h]] & ~self.split_game[t, s]
+        self.stats['blackjacks'][t[blackjack], s] += 1
+        self._push(t[blackjack], s, h[blackjack])
+        self._lose(t[~blackjack], s, h[~blackjack])
+
+    def _each_hand(self, tables, f):
+        if len(tables) == 0:
+            return
+        for s in range(len(self.seats)):
+            for n in range(self.nhands[tables, s].max()):
+                t = tables[self.live[tables, s, n]]
+                f(t, s, np.full(len(t), n, dtype=np.int32))
+
+    def _playing(self, tables):
+        return tables[self.live[tables].any(axis=(1, 2))]
+
+    def _close(self, t, s, h):
+        self.wager[t, s, h] = 0
+        self.live[t, s, h] = False
+        self.hand_count[t, s] = 1
+
+    def _win(self, t, s, h, num=1, den=1):
+        wager = self.wager[t, s, h]
+        winnings = (num * wager) // den
+        self.bankroll[t, s] += winnings + wager
+        self.stats['wins'][t, s] += 1
+        self.stats['hand_squares'][t, s] += winnings * winnings
+        self._close(t, s, h)
+
+    def _lose(self, t, s, h):
+        wager = self.wager[t, s, h]
+        self.stats['loses'][t, s] += 1
+        self.stats['hand_squares'][t, s] += wager * wager
+        self._close(t, s, h)
+
+    def _push(self, t, s, h):
+        self.bankroll[t, s] += self.wager[t, s, h]
+        self.stats['pushes'][t, s] += 1
+        self._close(t, s, h)
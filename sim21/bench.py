@@ -0,0 +1,231 @@
+"""
+Micro-benchmarks of the simulation components. Each benchmark repeats one
+operation (a shoe dealt to the reshuffle point, a card, a hand query, a
+strategy decision, a split or a whole game) and reports the best rate in
+operations per second over a number of timed runs. Results can be saved as a
+JSON baseline and later runs compared against it, failing when any rate falls
+by more than a threshold.
+"""
+
+# system imports
+import json
+import platform
+import random
+import sys
+import time
+import traceback
+
+# 3rd party imports
+import tabulate
+
+# project imports
+from .cmdline import parse_bench_cmdline
+from .config import Config
+from .game import Game
+from .hand import hand_state
+from .player import BasePlayer
+from .players import Players
+from .shoe import ACE, Shoe
+from .context import GameContext
+from .strategies import Basic, Simple
+
+# exported constants
+BENCH_METRICS_KEY = 'metrics'
+BENCH_PYTHON_KEY = 'python'
+
+# constants
+_SEED = 21
+_MIN_TIME = 0.1     # seconds per timed run
+_NOPS = 20000
+_NSHUFFLES = 200
+_NGAMES = 500
+_DECISIONS = ('hit', 'doubledown', 'split', 'surrender')
+
+
+def main(argv=sys.argv):
+    try:
+        args = parse_bench_cmdline(argv)
+        return _bench(args)
+    except Exception as e:
+        traceback.print_exc()
+        return 1
+
+
+def _bench(args):
+    config = Config(args.cfile)
+    metrics = run_benchmarks(config, args.repeat)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump({BENCH_PYTHON_KEY: platform.python_version(),
+                       BENCH_METRICS_KEY: metrics}, f, indent=2,
+                      sort_keys=True)
+    if args.compare is None:
+        print(tabulate.tabulate([[name, '%0.0f' % rate]
+                                 for name, rate in metrics.items()],
+                                headers=['Benchmark', 'Ops/s']))
+        return 0
+    with open(args.compare) as f:
+        baseline = json.load(f)[BENCH_METRICS_KEY]
+    regressions = compare(baseline, metrics, args.threshold)
+    return 1 if regressions else 0
+
+
+def run_benchmarks(config, repeat):
+    metrics = {}
+    for name, ops, run in _benchmarks(config):
+        metrics[name] = max(_rate(run, ops) for _ in range(repeat))
+    return metrics
+
+
+def compare(baseline, metrics, threshold):
+    table = []
+    regressions = []
+    for name, rate in metrics.items():
+        base = baseline.get(name)
+        if base is None:
+            table.append([name, '', '%0.0f' % rate, '', 'new'])
+            continue
+        change = rate / base - 1
+        status = 'ok'
+        if change < -threshold:
+            status = 'REGRESSION'
+            regressions.append(name)
+        table.append([name, '%0.0f' % base, '%0.0f' % rate,
+                      '%+0.1f' % (100 * change), status])
+    print(tabulate.tabulate(table, headers=['Benchmark', 'Baseline',
+                                            'Ops/s', 'Change (%)',
+                                            'Status']))
+    return regressions
+
+
+def _rate(run, ops):
+    # repeat the benchmark until the run is long enough to time reliably
+    count = 0
+    start = time.perf_counter()
+    while True:
+        run()
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= _MIN_TIME:
+            return count * ops / elapsed
+
+
+def _benchmarks(config):
+    yield _shuffle(config)
+    yield _next(config)
+    hands = _hands()
+    for query in ('score', 'is_soft', 'blackjack'):
+        yield _hand_query(hands, query)
+    for cls in (Basic, Simple):
+        for decision in _DECISIONS:
+            yield _decision(config, hands, cls, decision)
+    yield _split(config)
+    yield _game(config)
+
+
+def _shuffle(config):
+    # the shuffle is lazy, so a shoe is shuffled by dealing it down to the
+    # reshuffle point
+    shoe = Shoe(config.shoe, random.Random(_SEED))
+    depth = max(1, int(shoe.ncards * config.reshuffle))
+
+    def run():
+        for _ in range(_NSHUFFLES):
+            shoe.shuffle()
+            for _ in range(depth):
+                shoe.next()
+    return 'shoe.shuffle', _NSHUFFLES, run
+
+
+def _next(config):
+    shoe = Shoe(config.shoe, random.Random(_SEED))
+    shoe.shuffle()
+    ncards = shoe.ncards
+
+    def run():
+        for _ in range(_NOPS // ncards):
+            # every card dealt is shuffled as it is dealt
+            shoe.shuffle()
+            for _ in range(ncards):
+                shoe.next()
+    return 'shoe.next', _NOPS // ncards * ncards, run
+
+
+def _hands():
+    # every two card hand and a sample of three card hands
+    rng = random.Random(_SEED)
+    hands = []
+    for first in range(ACE, 11):
+        for second in range(ACE, 11):
+            hands.append((first, second))
+            hands.append((first, second, rng.randint(ACE, 10)))
+    players = []
+    for cards in hands:
+        player = BasePlayer()
+        player.hand = list(cards)
+        player.state = hand_state(cards)
+        players.append(player)
+    return players
+
+
+def _hand_query(hands, query):
+    methods = [getattr(player, query) for player in hands]
+    nloop = _NOPS // len(methods)
+
+    def run():
+        for _ in range(nloop):
+            for method in methods:
+                method()
+    return 'hand.%s' % query, nloop * len(methods), run
+
+
+def _decision(config, hands, cls, decision):
+    game = Game(None, config, _SEED)
+    strategy = cls()
+    strategy.bind(game.context)
+    method = getattr(strategy, decision)
+    hands = [h for h in hands if len(h.hand) == 2 or decision == 'hit']
+    upcards = range(ACE, 11)
+    nloop = max(1, _NOPS // (len(hands) * len(upcards)))
+
+    def run():
+        dealer = game.dealer
+        for _ in range(nloop):
+            for upcard in upcards:
+                dealer.close_hand()
+                dealer.receive(upcard)
+                for player in hands:
+                    method(player)
+    return '%s.%s' % (cls.__name__.lower(), decision), \
+        nloop * len(upcards) * len(hands), run
+
+
+def _split(config):
+    players = Players(GameContext(config), None)
+    player = next(iter(players))
+    # the split hand is only closed by cleanup when it carries a wager
+    player.wager = config.minimum
+
+    def run():
+        for _ in range(_NOPS):
+            player.close_hand()
+            player.receive(8)
+            player.receive(8)
+            players.split(player, 8, 8)
+            players.cleanup()
+            player.bankroll += player.wager
+    return 'players.split', _NOPS, run
+
+
+def _game(config):
+    hands = [0]
+
+    def run():
+        game = Game(None, config, _SEED)
+        game.play(_NGAMES)
+        hands[0] = sum(p.stats.wins + p.stats.loses + p.stats.pushes
+                       for p in game.players)
+    # the rate is hands played per second, so the count comes from a
+    # first run
+    run()
+    return 'game.play', hands[0], run
@@ -0,0 +1,203 @@
+"""
+Basic strategy chart generator. The total-dependent basic strategy of a
+configuration is computed from the exact probabilities of the dealer's final
+totals for every upcard, taken over the shoe without the upcard, and the
+expected values of the player's decisions, recursing through the hand states
+with the player drawing from the same shoe. Each decision is made on the
+total alone, as a chart makes it, and follows the rules of Game: the dealer
+only peeks with late surrender, so otherwise a dealer blackjack takes every
+unit wagered, split aces stand on one card but may double with DAS, and a
+pair is only split where its total is neither surrendered nor doubled, as
+Game decides those first.
+
+Generated charts are cached on disk by a hash of the rules they depend on.
+"""
+
+# system imports
+import hashlib
+import json
+import os
+import sys
+import traceback
+
+# project imports
+from .cmdline import parse_chart_cmdline
+from .config import Config, GAME_SURRENDER_NONE, GAME_SURRENDER_LATE
+from .game import dealer_strategy
+from .hand import hand_state
+from .probability import CARD_VALUES, SPLIT_HANDS_MAX, DealerTotals, \
+    PlayerValues, remove_card
+from .shoe import ACE, Deck
+from .strategies import Soft17
+from .strategies.chart import CHART_HARD_KEY, CHART_SOFT_KEY, \
+    CHART_PAIR_KEY, CHART_UPCARDS
+
+# exported constants
+CHART_CACHE_DIR = os.path.join('~', '.cache', 'sim21', 'charts')
+
+# constants
+_GENERATOR_VERSION = 2    # bump when the generated charts change
+_HARD_TOTALS = range(4, 22)
+_SOFT_TOTALS = range(12, 22)
+_SURRENDER = -0.5
+
+
+def main(argv=sys.argv):
+    try:
+        args = parse_chart_cmdline(argv)
+        _chart(args)
+    except Exception as e:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def _chart(args):
+    chart = generate_chart(Config(args.cfile),
+                           None if args.no_cache else args.cache)
+    text = json.dumps(chart, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+
+def rules_hash(config):
+    # only the rules that change a decision are hashed
+    rules = {
+        'version': _GENERATOR_VERSION,
+        'soft17': isinstance(dealer_strategy(config), Soft17),
+        'decks': config.shoe,
+        'DAS': config.DAS,
+        'maxhands': config.maxhands,
+        'surrender': config.surrender
+    }
+    text = json.dumps(rules, sort_keys=True).encode()
+    return hashlib.sha256(text).hexdigest()
+
+
+def generate_chart(config, cache_dir=CHART_CACHE_DIR):
+    path = None
+    if cache_dir is not None:
+        cache_dir = os.path.expanduser(cache_dir)
+        path = os.path.join(cache_dir, '%s.json' % rules_hash(config))
+        if os.path.exists(path):
+            with open(path) as f:
+                return json.load(f)
+    chart = ChartGenerator(config).chart()
+    if path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        # written aside and renamed, so readers never see a partial chart
+        partial = '%s.%d' % (path, os.getpid())
+        with open(partial, 'w') as f:
+            json.dump(chart, f, indent=2)
+        os.replace(partial, path)
+    return chart
+
+
+def _rows(codes, key=str):
+    # consecutive totals with the same row share a "<first>-<last>" key
+    rows = {}
+    first = last = row = None
+    for total, decisions in codes:
+        text = ' '.join('%-2s' % code for code in decisions).rstrip()
+        if text == row:
+            last = total
+            continue
+        if row is not None:
+            rows[_key(first, last, key)] = row
+        first = last = total
+        row = text
+    if row is not None:
+        rows[_key(first, last, key)] = row
+    return rows
+
+
+def _key(first, last, key):
+    if first == last:
+        return key(first)
+    return '%s-%s' % (key(first), key(last))
+
+
+class ChartGenerator(object):
+
+    def __init__(self, config):
+        self.das = config.DAS
+        self.maxhands = config.maxhands or SPLIT_HANDS_MAX
+        self.surrender = config.surrender
+        self.peek = self.surrender == GAME_SURRENDER_LATE
+        self.dealer = DealerTotals(isinstance(dealer_strategy(config), Soft17))
+        self.shoe = (0,) + tuple(config.shoe * Deck.values.count(v)
+                                 for v in CARD_VALUES)
+
+    def chart(self):
+        hard = {t: [] for t in _HARD_TOTALS}
+        soft = {t: [] for t in _SOFT_TOTALS}
+        pair = {v: [] for v in CARD_VALUES}
+        for upcard in CHART_UPCARDS:
+            self._upcard(upcard)
+            for total in _HARD_TOTALS:
+                hard[total].append(self._code(_hard_state(total)))
+            for total in _SOFT_TOTALS:
+                soft[total].append(self._code(_soft_state(total)))
+            for value in CARD_VALUES:
+                pair[value].append(self._pair_code(value))
+        return {
+            CHART_HARD_KEY: _rows(hard.items()),
+            CHART_SOFT_KEY: _rows(soft.items()),
+            CHART_PAIR_KEY: _rows(pair.items(),
+                                  key=lambda v: 'A' if v == ACE else str(v))
+        }
+
+    def _upcard(self, upcard):
+        self.comp = remove_card(self.shoe, upcard)
+        final, blackjack = self.dealer.probabilities(upcard, self.comp)
+        # the player draws from the same shoe whatever the cards drawn
+        self.values = PlayerValues(final, blackjack, self.das, self.maxhands,
+                                   self.peek, deplete=False)
+
+    def _code(self, state):
+        values = self.values
+        stand = values.stand(state)
+        hit = values.hit(state, self.comp)
+        base = 'H' if hit > stand else 'S'
+        best = values.overall(max(hit, stand), 1)
+        code = base
+        double = values.overall(values.double(state, self.comp), 2)
+        if double > best:
+            code = 'D' + base.lower()
+            best = double
+        # half the wager is lost whether the dealer has a blackjack or not
+        if self.surrender != GAME_SURRENDER_NONE and _SURRENDER > best:
+            code = 'R' + base.lower()
+        return code
+
+    def _pair_code(self, value):
+        if self.maxhands == 1:
+            return '-'
+        values = self.values
+        state = hand_state((value, value))
+        # Game surrenders and doubles a pair before it considers a split,
+        # so a split is only reached where the total's row does neither
+        if self._code(state)[0] in 'DR':
+            return '-'
+        best = values.overall(max(values.hit(state, self.comp),
+                                  values.stand(state)), 1)
+        split = values.overall(*values.split(value, self.comp))
+        return 'P' if split > best else '-'
+
+
+def _hard_state(total):
+    if total <= 12:
+        return hand_state((2, total - 2))
+    if total <= 20:
+        return hand_state((10, total - 10))
+    return hand_state((10, 9, 2))
+
+
+def _soft_state(total):
+    if total == 21:
+        # a two card soft 21 is a blackjack, never a decision
+        return hand_state((ACE, 5, 5))
+    return hand_state((ACE, total - 11))
@@ -12,7 +12,15 @@ SFORMAT_NORMAL = 'normal'
 
 # constants
 _NGAME_DEFAULT = 1000
+_JOBS_DEFAULT = 1
 _SFORMAT_DEFAULT = SFORMAT_NORMAL
+_REPEAT_DEFAULT = 5
+_THRESHOLD_DEFAULT = 0.1
+_TRIALS_DEFAULT = 100000
+_DEVIATIONS_DEFAULT = ['illustrious18', 'fab4']
+_CHART_DEFAULT = 'basic'
+_SYSTEM_DEFAULT = 'hilo'
+_CACHE_DEFAULT = os.path.join('~', '.cache', 'sim21', 'charts')
 
 
 def _positive_definite(string):
@@ -22,6 +30,20 @@ def _positive_definite(string):
     return n
 
 
+def _non_negative(string):
+    n = int(string)
+    if n < 0:
+        raise argparse.ArgumentTypeError("value must be >= 0")
+    return n
+
+
+def _positive_float(string):
+    x = float(string)
+    if x <= 0.0:
+        raise argparse.ArgumentTypeError("value must be > 0")
+    return x
+
+
 def _file_exists(fpath):
     if not os.path.exists(fpath):
         raise argparse.ArgumentTypeError("'%s' does not exist" % fpath)
@@ -33,11 +55,45 @@ def parse_cmdline(argv):
     parser.add_argument('-q', '--quiet', action='store_true',
                         help="no output")
     parser.add_argument('-r', '--rfile', default=None,
-                        help="basename of JSON files for simulation recording")
+                        help="NDJSON log file for simulation recording "
+                             "(gzip compressed if it ends in .gz)")
     parser.add_argument('-n', '--ngame', type=_positive_definite,
                         default=_NGAME_DEFAULT,
                         help="number of games per simulation (default %d)"
                              % _NGAME_DEFAULT)
+    parser.add_argument('-j', '--jobs', type=_positive_definite,
+                        default=_JOBS_DEFAULT,
+                        help="number of worker processes (default %d)"
+                             % _JOBS_DEFAULT)
+    parser.add_argument('--threads', action='store_true',
+                        help="run the jobs in threads instead of processes "
+                             "when the interpreter has no GIL")
+    parser.add_argument('-b', '--batch', type=_positive_definite,
+                        default=None,
+                        help="simulate this many tables at once with the "
+                             "NumPy batch engine")
+    parser.add_argument('-p', '--paired', action='store_true',
+                        help="play every player alone on the same cards "
+                             "and report differences from the first player")
+    parser.add_argument('--replay', default=None, type=_file_exists,
+                        help="NDJSON recording whose cards are dealt again "
+                             "instead of shuffled shoes")
+    parser.add_argument('--profile', action='store_true',
+                        help="report the time spent in each phase of the "
+                             "games and the hands played per second")
+    parser.add_argument('--pstats', default=None,
+                        help="profile the run with cProfile and write the "
+                             "statistics to this file (implies --profile)")
+    parser.add_argument('--seed', type=_non_negative, default=None,
+                        help="root seed for the random number streams "
+                             "(default is random)")
+    parser.add_argument('--first', type=_non_negative, default=0,
+                        help="index of the first simulation (default 0)")
+    parser.add_argument('-t', '--target-precision', type=_positive_float,
+                        default=None,
+                        help="repeat nsim simulations until the 95%% "
+                             "confidence interval half-width of every "
+                             "outcome is below this value")
     parser.add_argument('-s', '--sformat',
                         choices=(SFORMAT_RAW, SFORMAT_NORMAL),
                         default=_SFORMAT_DEFAULT,
@@ -50,3 +106,85 @@ def parse_cmdline(argv):
                         help="JSON file for statistics output (default is "
                              "stdout)")
     return parser.parse_args(argv[1:])
+
+
+def parse_edge_cmdline(argv):
+    parser = argparse.ArgumentParser(
+        description="Casino Blackjack House Edge")
+    parser.add_argument('cfile', type=_file_exists,
+                        help="JSON file for simulation configuration")
+    return parser.parse_args(argv[1:])
+
+
+def parse_bench_cmdline(argv):
+    parser = argparse.ArgumentParser(
+        description="Casino Blackjack Benchmarks")
+    parser.add_argument('-o', '--output', default=None,
+                        help="JSON file for the benchmark baseline")
+    parser.add_argument('-c', '--compare', default=None, type=_file_exists,
+                        help="JSON baseline to compare against; exits with "
+                             "an error if any benchmark regresses")
+    parser.add_argument('-t', '--threshold', type=_positive_float,
+                        default=_THRESHOLD_DEFAULT,
+                        help="fractional slowdown counted as a regression "
+                             "(default %0.2f)" % _THRESHOLD_DEFAULT)
+    parser.add_argument('-n', '--repeat', type=_positive_definite,
+                        default=_REPEAT_DEFAULT,
+                        help="number of timed runs of each benchmark, the "
+                             "best is kept (default %d)" % _REPEAT_DEFAULT)
+    parser.add_argument('cfile', type=_file_exists,
+                        help="JSON file for simulation configuration")
+    return parser.parse_args(argv[1:])
+
+
+def parse_indices_cmdline(argv):
+    parser = argparse.ArgumentParser(
+        description="Casino Blackjack Index Numbers")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="no output")
+    parser.add_argument('-n', '--trials', type=_positive_definite,
+                        default=_TRIALS_DEFAULT,
+                        help="number of hands played each way for every "
+                             "deviation (default %d)" % _TRIALS_DEFAULT)
+    parser.add_argument('-j', '--jobs', type=_positive_definite,
+                        default=_JOBS_DEFAULT,
+                        help="number of worker processes (default %d)"
+                             % _JOBS_DEFAULT)
+    parser.add_argument('-d', '--deviations', action='append', default=None,
+                        help="deviation file whose hands are evaluated, may "
+                             "be repeated (default %s)"
+                             % ' and '.join(_DEVIATIONS_DEFAULT))
+    parser.add_argument('-c', '--chart', default=_CHART_DEFAULT,
+                        help="chart playing the other decisions (default "
+                             "%s)" % _CHART_DEFAULT)
+    parser.add_argument('--system', default=_SYSTEM_DEFAULT,
+                        help="count system of the true count (default %s)"
+                             % _SYSTEM_DEFAULT)
+    parser.add_argument('--seed', type=_non_negative, default=None,
+                        help="root seed for the random number streams "
+                             "(default is random)")
+    parser.add_argument('-o', '--output', default=None,
+                        help="deviation file to write with the simulated "
+                             "indices")
+    parser.add_argument('cfile', type=_file_exists,
+                        help="JSON file for simulation configuration")
+    args = parser.parse_args(argv[1:])
+    if args.deviations is None:
+        args.deviations = list(_DEVIATIONS_DEFAULT)
+    return args
+
+
+def parse_chart_cmdline(argv):
+    parser = argparse.ArgumentParser(
+        description="Casino Blackjack Basic Strategy Chart")
+    parser.add_argument('-o', '--output', default=None,
+                        help="JSON chart file to write (default is stdout)")
+    parser.add_argument('--cache', default=_CACHE_DEFAULT,
+                        help="directory of generated charts (default %s)"
+                             % _CACHE_DEFAULT)
+    parser.add_argument('--no-cache', action='store_true',
+                        help="generate the chart even if it is cached, "
+                             "without caching it")
+    parser.add_argument('cfile', type=_file_exists,
+                        help="JSON file for simulation configuration")
+    return parser.parse_args(argv[1:])
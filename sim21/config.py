@@ -24,6 +24,7 @@ GAME_MAXHANDS_UNLIMITED = 0
 GAME_SURRENDER_NONE = 'none'
 GAME_SURRENDER_LATE = 'late'
 GAME_SURRENDER_EARLY = 'early'
+GAME_RESHUFFLE_CSM = 'csm'
 
 # constants
 _PLAYERS_KEY = 'players'
@@ -142,9 +143,17 @@ class Config(object):
                                  GAME_SURRENDER_EARLY]
                     },
                     _GAME_RESHUFFLE_KEY: {
-                        'type': 'number',
-                        'minimum': 0.0,
-                        'exclusiveMaximum': 1.0
+                        'oneOf': [
+                            {
+                                'type': 'number',
+                                'minimum': 0.0,
+                                'exclusiveMaximum': 1.0
+                            },
+                            {
+                                'type': 'string',
+                                'enum': [GAME_RESHUFFLE_CSM]
+                            }
+                        ]
                     }
                 },
                 'additionalProperties': False
@@ -210,7 +219,13 @@ class Config(object):
     @property
     @_config_decorator
     def reshuffle(self):
-        return self._game_config(_GAME_RESHUFFLE_KEY, _GAME_RESHUFFLE_DEFAULT)
+        reshuffle = self._game_config(_GAME_RESHUFFLE_KEY,
+                                      _GAME_RESHUFFLE_DEFAULT)
+        if reshuffle == GAME_RESHUFFLE_CSM:
+            # a continuous shuffling machine takes the discards back after
+            # every round, as a reshuffle once any card is dealt
+            return 0.0
+        return reshuffle
 
     @property
     @_config_decorator
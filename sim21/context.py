@@ -0,0 +1,15 @@
+"""
+Game context. Every game builds one and binds it to its players and
+strategies when they are created, so they reach the configuration and the
+dealer through plain attributes instead of module globals, and games in the
+same interpreter are independent of each other.
+"""
+
+
+class GameContext(object):
+
+    def __init__(self, config, game=None, dealer=None, shoe=None):
+        self.config = config
+        self.game = game
+        self.dealer = dealer
+        self.shoe = shoe
@@ -0,0 +1,100 @@
+"""
+Composition of the cards left in a shoe. Once a shoe is observed it reports
+every card it deals here, and the counts keep the number of unseen cards of
+each value, the running count of every registered count system and the
+subscribers to notify of each card. The dealer's hole card is held back
+until it is revealed at the end of the round, so decisions never depend on
+it.
+
+Tags of the count systems are indexed by card value, an ace being 1.
+"""
+
+# exported constants
+COUNT_HILO = 'hilo'
+COUNT_KO = 'ko'
+COUNT_OMEGA_II = 'omega2'
+COUNT_ZEN = 'zen'
+COUNT_SYSTEMS = {
+    #                A  2  3  4  5  6  7  8   9  10
+    COUNT_HILO: (0, -1, 1, 1, 1, 1, 1, 0, 0, 0, -1),
+    COUNT_KO: (0, -1, 1, 1, 1, 1, 1, 1, 0, 0, -1),
+    COUNT_OMEGA_II: (0, 0, 1, 1, 2, 2, 2, 1, 0, -1, -2),
+    COUNT_ZEN: (0, -1, 1, 1, 2, 2, 2, 1, 0, 0, -2)
+}
+DECK_CARDS = 52
+
+# constants
+_DECK = (0, 4, 4, 4, 4, 4, 4, 4, 4, 4, 16)
+
+
+class ShoeCounts(object):
+
+    def __init__(self, ndecks):
+        self.ndecks = ndecks
+        self.tags = {}
+        self.running = {}
+        self.subscribers = []
+        self.reset()
+
+    def reset(self):
+        self.remaining = [n * self.ndecks for n in _DECK]
+        self.unseen = DECK_CARDS * self.ndecks
+        self.hole = None
+        for name in self.running:
+            self.running[name] = 0
+        for subscriber in self.subscribers:
+            subscriber(None)
+
+    def add_system(self, name, tags=None):
+        # the running count of a system added mid-shoe starts from the cards
+        # already seen
+        if tags is None:
+            tags = COUNT_SYSTEMS[name]
+        tags = tuple(tags)
+        if len(tags) != len(_DECK):
+            raise ValueError("count system %s needs a tag for every value"
+                             % name)
+        self.tags[name] = tags
+        self.running[name] = sum(
+            tag * (n * self.ndecks - remaining)
+            for tag, n, remaining in zip(tags, _DECK, self.remaining))
+
+    def subscribe(self, subscriber):
+        # subscriber(card) is called for every card seen, and with None when
+        # the shoe is shuffled
+        self.subscribers.append(subscriber)
+
+    def see(self, card):
+        self.remaining[card] -= 1
+        self.unseen -= 1
+        running = self.running
+        for name, tags in self.tags.items():
+            running[name] += tags[card]
+        for subscriber in self.subscribers:
+            subscriber(card)
+
+    def hide(self, card):
+        self.hole = card
+
+    def reveal(self):
+        if self.hole is not None:
+            card = self.hole
+            self.hole = None
+            self.see(card)
+
+    def decks_remaining(self):
+        return self.unseen / DECK_CARDS
+
+    def true_count(self, name):
+        if self.unseen == 0:
+            return 0.0
+        return self.running[name] * DECK_CARDS / self.unseen
+
+    def save(self):
+        return list(self.remaining), self.unseen, self.hole, \
+            dict(self.running)
+
+    def restore(self, state):
+        remaining, self.unseen, self.hole, running = state
+        self.remaining[:] = remaining
+        self.running.update(running)
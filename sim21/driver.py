@@ -5,7 +5,12 @@ article:
 """
 
 # system imports
+from concurrent.futures import ThreadPoolExecutor
+import cProfile
+import multiprocessing
+import multiprocessing.util
 import sys
+import threading
 import traceback
 
 # 3rd party imports
@@ -15,8 +20,19 @@ from tqdm import tqdm
 from .cmdline import parse_cmdline
 from .config import Config
 from .game import Game
-from .strategies import set_config, set_game, strategy_reset
+from .paired import PairedGame
+from .history import HandLog, HISTORY_SUFFIX
+from .oracle import collect_oracles, save_oracles
+from .recorder import RecordLog
+from .replay import ReplayGame, card_stream
+from .rng import root_seed
 from .stats import SimStats
+from .timing import PhaseTimers
+
+# global variables
+_worker_config = None
+_worker_log = None
+_local = threading.local()
 
 
 def main(argv=sys.argv):
@@ -31,38 +47,220 @@ def main(argv=sys.argv):
 
 def _sim(args):
     config = Config(args.cfile)
-    set_config(config)
+    if args.paired and args.rfile is not None:
+        raise ValueError("recording is not supported in paired mode")
+    if args.replay is not None and (args.paired or args.rfile is not None):
+        raise ValueError("replay cannot be paired or recorded")
+    timers = None
+    profiler = None
+    if args.profile or args.pstats is not None:
+        if args.jobs != 1 or args.batch is not None:
+            raise ValueError("profiling needs a single process without the "
+                             "batch engine")
+        timers = PhaseTimers()
+        if args.pstats is not None:
+            profiler = cProfile.Profile()
+    if args.threads and _gil_enabled() and not args.quiet:
+        print("the GIL is enabled, running jobs in processes",
+              file=sys.stderr)
     stats = SimStats(args.sfile, args.sformat)
+    seed = root_seed(args.seed)
+    first = args.first
+    log = None
+    if args.rfile is not None:
+        log = _record_log(args.rfile, config, truncate=True)
+    if profiler is not None:
+        profiler.enable()
     try:
-        for i in _progress(args.quiet, args.nsim):
-            _play(_rfile(args.rfile, i), args.ngame, config, stats)
+        while True:
+            _run(args, config, stats, seed, log,
+                 range(first, first + args.nsim), timers)
+            first += args.nsim
+            if args.target_precision is None \
+               or stats.precision() < args.target_precision:
+                break
     finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.pstats)
+        if log is not None:
+            log.close()
+        save_oracles()
+        _game_cache().clear()
         stats.dump()
         if not args.quiet:
             stats.display()
+            if timers is not None:
+                timers.display()
+            print("seed: %d" % seed)
+            if args.target_precision is not None:
+                print("simulations: %d" % (first - args.first))
 
 
-def _progress(quiet, nsim):
-    if quiet:
-        return range(nsim)
+def _run(args, config, stats, seed, log, indices, timers=None):
+    if args.batch is not None:
+        _sim_batch(args, config, stats, seed, indices)
+    elif args.jobs == 1:
+        for i in _progress(args.quiet, indices, args.nsim):
+            _play(log, args.ngame, config, stats, seed, i, args.paired,
+                  args.replay, timers)
+    elif args.threads and not _gil_enabled():
+        _sim_threaded(args, config, stats, seed, indices)
     else:
-        return tqdm(range(nsim))
+        _sim_parallel(args, stats, seed, indices)
+
+
+def _gil_enabled():
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is None or is_gil_enabled()
+
+
+def _sim_threaded(args, config, stats, seed, indices):
+    # every thread keeps its own games and record log; the results of each
+    # simulation are merged by the calling thread
+    local = threading.local()
+    logs = []
+
+    def task(index):
+        log = getattr(local, 'log', None)
+        if log is None and args.rfile is not None:
+            log = local.log = _record_log(args.rfile, config)
+            logs.append(log)
+        result = SimStats(None, None)
+        _play(log, args.ngame, config, result, seed, index, args.paired,
+              args.replay)
+        return result.payload()
+
+    try:
+        with ThreadPoolExecutor(args.jobs) as pool:
+            for payload in _progress(args.quiet, pool.map(task, indices),
+                                     args.nsim):
+                stats.merge(payload)
+    finally:
+        for log in logs:
+            log.close()
 
 
-def _rfile(rfile, count):
-    if rfile is None:
-        return rfile
-    return "%s-%d.json" % (rfile, count)
+def _sim_parallel(args, stats, seed, indices):
+    tasks = ((args.ngame, seed, i, args.paired, args.replay)
+             for i in indices)
+    with multiprocessing.Pool(args.jobs, _init_worker,
+                              (args.cfile, args.rfile)) as pool:
+        for payload in _progress(args.quiet,
+                                 pool.imap_unordered(_worker, tasks),
+                                 args.nsim):
+            stats.merge(payload)
+        # the workers exit on their own, so their finalizers run
+        pool.close()
+        pool.join()
 
 
-def _play(rfile, ngame, config, stats):
-    game = Game(rfile, config)
-    set_game(game)
+def _sim_batch(args, config, stats, seed, indices):
+    if args.rfile is not None:
+        raise ValueError("recording is not supported by the batch engine")
+    if args.paired or args.replay is not None:
+        raise ValueError("paired mode and replay are not supported by the "
+                         "batch engine")
+    tasks = ((args.ngame, seed, indices[i:i + args.batch])
+             for i in range(0, args.nsim, args.batch))
+    if args.jobs == 1:
+        _merge_batches(args, stats,
+                       (_batch_play(config, *task) for task in tasks))
+    else:
+        with multiprocessing.Pool(args.jobs, _init_worker,
+                                  (args.cfile, None)) as pool:
+            _merge_batches(args, stats,
+                           pool.imap_unordered(_batch_worker, tasks))
+
+
+def _merge_batches(args, stats, results):
+    with tqdm(total=args.nsim, disable=args.quiet) as progress:
+        for count, payload in results:
+            stats.merge(payload)
+            progress.update(count)
+
+
+def _batch_worker(task):
+    return _batch_play(_worker_config, *task)
+
+
+def _batch_play(config, ngame, seed, indices):
+    from .batch import BatchGame
+    game = BatchGame(config, seed, indices)
     game.play(ngame)
+    return len(indices), game.payload()
+
+
+def _init_worker(cfile, rfile):
+    global _worker_config, _worker_log
+    _worker_config = Config(cfile)
+    multiprocessing.util.Finalize(None, save_oracles, exitpriority=0)
+    if rfile is not None:
+        _worker_log = _record_log(rfile, _worker_config)
+
+
+def _worker(task):
+    ngame, seed, index, paired, replay = task
+    stats = SimStats(None, None)
+    _play(_worker_log, ngame, _worker_config, stats, seed, index, paired,
+          replay)
+    return stats.payload()
+
+
+def _record_log(rfile, config, truncate=False):
+    if rfile.endswith(HISTORY_SUFFIX):
+        return HandLog(rfile, config, truncate)
+    return RecordLog(rfile, truncate)
+
+
+def _progress(quiet, iterable, total):
+    if quiet:
+        return iterable
+    else:
+        return tqdm(iterable, total=total)
+
+
+def _play(log, ngame, config, stats, seed, index, paired=False,
+          replay=None, timers=None):
+    if paired:
+        game = _reusable(PairedGame, (config, seed), index)
+    elif replay is not None:
+        game = ReplayGame(config, card_stream(replay, index, config), index)
+    else:
+        game = _reusable(Game, (log, config, seed), index)
+    if timers is None:
+        game.play(ngame)
+    else:
+        for g in getattr(game, 'games', [game]):
+            timers.instrument(g)
+        timers.play(game, ngame)
     _stats(game, stats)
-    strategy_reset()
+
+
+def _reusable(cls, args, index):
+    # games are built once per run (and worker process or thread) and reset
+    # between simulations
+    key = (cls,) + args
+    games = _game_cache()
+    game = games.get(key)
+    if game is None:
+        game = games[key] = cls(*args, index)
+    else:
+        game.reset(index)
+    return game
+
+
+def _game_cache():
+    try:
+        return _local.games
+    except AttributeError:
+        _local.games = {}
+        return _local.games
 
 
 def _stats(game, stats):
     for player in game.players:
         stats.add_player(player)
+    if isinstance(game, PairedGame):
+        stats.add_pairs(game.pairs)
+    stats.add_oracles(collect_oracles())
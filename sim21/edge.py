@@ -0,0 +1,189 @@
+"""
+Analytical house edge. Every starting hand and dealer upcard is enumerated
+over the composition of the shoe, and the expected value of the hand is
+computed by recursing through the decisions of a table-driven playing
+strategy against the dealer's final-total probabilities.
+
+The result is near-exact: the player's draws deplete the shoe, the dealer's
+probabilities are taken from the shoe after the two player cards and the
+upcard, and the hands of a split are played from the shoe after the pair.
+Resplits are counted for the maxhands limit without the extra pair cards
+removed. Rules are those of Game, so the figures can be checked against a
+simulation of the same configuration.
+"""
+
+# system imports
+import sys
+import traceback
+
+# 3rd party imports
+import tabulate
+
+# project imports
+from .cmdline import parse_edge_cmdline
+from .config import Config, PLAYER_NAME_KEY, PLAYER_STRATEGIES_KEY, \
+    STRATEGY_PLAYING_KEY, STRATEGY_CLASS_KEY, GAME_SURRENDER_EARLY, \
+    GAME_SURRENDER_LATE
+from .game import dealer_strategy, blackjack_multiplier
+from .hand import EMPTY, TRANSITION, SCORE, BUSTED, BLACKJACK, PAIR
+from .players import create_strategy
+from .probability import CARD_VALUES, DEALER_TOTALS, DEALER_BUST, \
+    SPLIT_HANDS_MAX, DealerTotals, remove_card, split_hands
+from .shoe import ACE, Deck
+from .strategies import Soft17
+from .strategies.chart import strategy_tables
+
+
+def main(argv=sys.argv):
+    try:
+        args = parse_edge_cmdline(argv)
+        _edge(args)
+    except Exception as e:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def _edge(args):
+    config = Config(args.cfile)
+    edge = HouseEdge(config)
+    values = {}
+    table = []
+    for player_config in config.player_configs():
+        strategy_config = player_config[PLAYER_STRATEGIES_KEY][
+            STRATEGY_PLAYING_KEY]
+        tables = strategy_tables(create_strategy(strategy_config))
+        if tables not in values:
+            values[tables] = edge.expected_value(tables)
+        table.append([player_config[PLAYER_NAME_KEY],
+                      strategy_config[STRATEGY_CLASS_KEY],
+                      '%0.3f' % (-100 * values[tables])])
+    print(tabulate.tabulate(table, headers=['Player', 'Strategy',
+                                            'Edge (%)']))
+
+
+def _draws(comp):
+    total = sum(comp)
+    return [(v, comp[v] / total, remove_card(comp, v))
+            for v in CARD_VALUES if comp[v]]
+
+
+class HouseEdge(object):
+
+    def __init__(self, config):
+        self.das = config.DAS
+        self.maxhands = config.maxhands or SPLIT_HANDS_MAX
+        self.surrender = config.surrender
+        multiplier = blackjack_multiplier(config)
+        self.blackjack = multiplier.num / multiplier.den
+        self.dealer = DealerTotals(isinstance(dealer_strategy(config),
+                                              Soft17))
+        self.shoe = (0,) + tuple(config.shoe * Deck.values.count(v)
+                                 for v in CARD_VALUES)
+
+    def expected_value(self, tables):
+        self.tables = tables
+        ev = 0.0
+        for c1, p1, comp1 in _draws(self.shoe):
+            for c2, p2, comp2 in _draws(comp1):
+                if c2 < c1:
+                    continue
+                weight = p1 * p2 * (1 if c1 == c2 else 2)
+                for upcard, p3, comp in _draws(comp2):
+                    ev += weight * p3 * self._round(c1, c2, upcard, comp)
+        return ev
+
+    def _round(self, c1, c2, upcard, comp):
+        self.upcard = upcard
+        self.cache = {}
+        self.final, blackjack = self.dealer.probabilities(upcard, comp)
+        state = TRANSITION[TRANSITION[EMPTY + c1] + c2]
+        surrender = self.tables.surrender[state + upcard]
+        if surrender and self.surrender == GAME_SURRENDER_EARLY:
+            return -0.5
+        if BLACKJACK[state]:
+            return (1 - blackjack) * self._stand(state, False)
+        if surrender and self.surrender == GAME_SURRENDER_LATE:
+            return (1 - blackjack) * -0.5 - blackjack
+        ev, units = self._first(state, comp)
+        if self.surrender == GAME_SURRENDER_LATE:
+            # the dealer peeks, so only the original wager is lost
+            return (1 - blackjack) * ev - blackjack
+        return (1 - blackjack) * ev - blackjack * units
+
+    def _first(self, state, comp):
+        index = state + self.upcard
+        if PAIR[state] and self.maxhands != 1 \
+           and self.tables.split[index] \
+           and not self.tables.doubledown[index]:
+            return self._split(PAIR[state], comp)
+        return self._hand(state, comp, True, False, False)
+
+    def _split(self, card, comp):
+        start = TRANSITION[EMPTY + card]
+        pair = TRANSITION[start + card]
+        index = pair + self.upcard
+        resplit = self.tables.split[index] \
+            and not (self.das and self.tables.doubledown[index])
+        aces = card == ACE
+        other = other_units = 0.0
+        p = pair_ev = pair_units = 0.0
+        for v, q, rest in _draws(comp):
+            ev, units = self._hand(TRANSITION[start + v], rest, True, True,
+                                   aces)
+            if v == card:
+                p, pair_ev, pair_units = q, ev, units
+            else:
+                other += q * ev
+                other_units += q * units
+        if not resplit or p == 0.0:
+            return 2 * (other + p * pair_ev), \
+                2 * (other_units + p * pair_units)
+        nother, npair = split_hands(p, self.maxhands)
+        return (nother * other + npair * pair_ev * p) / (1 - p), \
+            (nother * other_units + npair * pair_units * p) / (1 - p)
+
+    def _hand(self, state, comp, first, split, aces):
+        # expected value and wager of a hand per unit of its initial wager
+        if BUSTED[state]:
+            return -1.0, 1.0
+        key = (state, comp, first, split, aces)
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+        index = state + self.upcard
+        if first and self.tables.doubledown[index] \
+           and (self.das or not split):
+            ev = 0.0
+            for v, p, rest in _draws(comp):
+                drawn = TRANSITION[state + v]
+                ev += p * (-1.0 if BUSTED[drawn]
+                           else self._stand(drawn, split))
+            result = 2 * ev, 2.0
+        elif self.tables.hit[index] and not aces:
+            ev = units = 0.0
+            for v, p, rest in _draws(comp):
+                hand_ev, hand_units = self._hand(TRANSITION[state + v], rest,
+                                                 False, split, aces)
+                ev += p * hand_ev
+                units += p * hand_units
+            result = ev, units
+        else:
+            result = self._stand(state, split), 1.0
+        self.cache[key] = result
+        return result
+
+    def _stand(self, state, split):
+        final = self.final
+        bust = final[DEALER_BUST]
+        if BLACKJACK[state] and not split:
+            # a blackjack is only paid the bonus when the dealer stands
+            return bust + (1 - bust) * self.blackjack
+        score = SCORE[state]
+        ev = bust
+        for total, p in zip(DEALER_TOTALS, final):
+            if score > total:
+                ev += p
+            elif score < total:
+                ev -= p
+        return ev
@@ -5,10 +5,12 @@ Simulation of a blackjack game.
 # project imports
 from .config import GAME_DEALER_H17, GAME_BLACKJACK_3_2, \
     GAME_SURRENDER_EARLY, GAME_SURRENDER_LATE
+from .context import GameContext
 from .shoe import Shoe
 from .player import Dealer
 from .players import Players
-from .recorder import DealerRecorder, dump_simulations
+from .recorder import DealerRecorder, Recording
+from .rng import root_seed, simulation_rng
 from .strategies import Soft17, Stand17
 
 
@@ -22,50 +24,90 @@ class _Multiplier(object):
         return (self.num * other) // self.den
 
 
+def dealer_strategy(config):
+    if config.dealer == GAME_DEALER_H17:
+        return Stand17()
+    else:
+        return Soft17()
+
+
+def blackjack_multiplier(config):
+    if config.blackjack == GAME_BLACKJACK_3_2:
+        return _Multiplier(3, 2)
+    else:
+        return _Multiplier(6, 5)
+
+
 class Game(object):
 
-    def __init__(self, rfile, config):
+    def __init__(self, log, config, seed=None, index=0, shoe=None,
+                 player_configs=None):
         self.config = config
-        self.shoe = Shoe(self.config.shoe)
-        if self.config.dealer == GAME_DEALER_H17:
-            dealer_strategy = Stand17()
-        else:
-            dealer_strategy = Soft17()
-        self.rfile = rfile
-        if self.rfile is None:
-            self.dealer = Dealer(dealer_strategy)
+        self.seed = root_seed(seed)
+        self.index = index
+        if shoe is None:
+            self.shoe = Shoe(self.config.shoe,
+                             simulation_rng(self.seed, index))
         else:
-            self.dealer = DealerRecorder(dealer_strategy)
-        if self.config.blackjack == GAME_BLACKJACK_3_2:
-            self.blackjack_multiplier = _Multiplier(3, 2)
+            self.shoe = shoe
+        self.context = GameContext(self.config, self, shoe=self.shoe)
+        strategy = dealer_strategy(self.config)
+        strategy.bind(self.context)
+        if log is None:
+            self.recording = None
+            self.dealer = Dealer(strategy)
         else:
-            self.blackjack_multiplier = _Multiplier(6, 5)
-        self.players = Players(self.config, self.rfile)
+            self.recording = Recording(log, self.seed, index)
+            self.dealer = DealerRecorder(strategy, self.recording)
+        self.context.dealer = self.dealer
+        self.blackjack_multiplier = blackjack_multiplier(self.config)
+        self.players = Players(self.context, self.recording, player_configs)
+        self.house = 0
+
+    def reset(self, index):
+        # prepare the game for another simulation of the same run
+        self.index = index
+        self.shoe.reset(simulation_rng(self.seed, index))
+        if self.recording is not None:
+            self.recording.reset(index)
+        self.dealer.close_hand()
+        self.dealer.playing_strategy.reset()
+        self.players.reset()
         self.house = 0
 
     def play(self, ngame):
         self.shoe.shuffle()
         count = 0
         while count < ngame:
-            try:
-                self._shuffle()
-                self._place_bets()
-                self._deal()
-                if self._surrender():
-                    continue
-                if self._player_hands():
-                    continue
-                if self._dealer_hand():
-                    continue
-                self._show_hands()
-            finally:
-                self.players.cleanup()
-                self.dealer.close_hand()
-                count += 1
-                if self._all_done():
-                    break
-        if self.rfile is not None:
-            dump_simulations(self.rfile)
+            self._shuffle()
+            self.play_round()
+            count += 1
+            if self.all_done():
+                break
+        if self.recording is not None:
+            self.recording.close()
+
+    def play_round(self):
+        if self.recording is not None:
+            self.recording.start_game()
+        try:
+            self._place_bets()
+            self._deal()
+            if self._surrender():
+                return
+            if self._player_hands():
+                return
+            if self._dealer_hand():
+                return
+            self._show_hands()
+        finally:
+            self.shoe.reveal()
+            self.players.cleanup()
+            for player in self.players:
+                player.stats.add_game()
+            self.dealer.close_hand()
+            if self.recording is not None:
+                self.recording.end_game()
 
     def _shuffle(self):
         if self.shoe.position() > self.config.reshuffle:
@@ -76,13 +118,13 @@ class Game(object):
             player.place_bet()
 
     def _deal(self):
-        self._deal_round()
-        self._deal_round()
+        self._deal_round(self.shoe.next)
+        self._deal_round(self.shoe.next_hole)
 
-    def _deal_round(self):
+    def _deal_round(self, dealer_card):
         for player in self._play_iter():
             player.receive(self.shoe.next())
-        self.dealer.receive(self.shoe.next())
+        self.dealer.receive(dealer_card())
 
     def _surrender(self):
         surrender_policy = self.config.surrender
@@ -95,7 +137,7 @@ class Game(object):
                 self._player_surrender()
         else:
             return False
-        return len(list(self._play_iter())) == 0
+        return self.players.active == 0
 
     def _player_surrender(self):
         for player in self._play_iter():
@@ -111,14 +153,15 @@ class Game(object):
                     self._busted(player)
                     break
                 if player.split():
-                    self.players.split(self.shoe.next(), self.shoe.next())
+                    self.players.split(player, self.shoe.next(),
+                                       self.shoe.next())
                     continue
                 first_call = False
                 while player.hit():
                     player.receive(self.shoe.next())
                     if self._busted(player):
                         break
-        return len(list(self._play_iter())) == 0
+        return self.players.active == 0
 
     def _busted(self, player):
         if player.busted():
@@ -159,11 +202,11 @@ class Game(object):
             else:
                 self.house += player.lose()
 
-    def _all_done(self):
-        return len(list(self._bet_iter())) == 0
+    def all_done(self):
+        return self.players.bankrolled == 0
 
     def _bet_iter(self):
-        return (p for p in self.players if p.is_bankrolled())
+        return self.players.bettors()
 
     def _play_iter(self):
         return (p for p in self.players if p.is_playing())
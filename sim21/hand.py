@@ -0,0 +1,75 @@
+"""
+Hand state machine. A hand is a small integer state encoding the hard total,
+whether the hand holds an ace, the number of cards and whether the first two
+cards are a pair. Each dealt card advances the state through a transition
+table built once at import, and the score, softness, bust and blackjack of a
+hand are single table reads.
+
+States are multiples of the number of card values, so the state reached by
+adding a card of value v to state s is TRANSITION[s + v].
+"""
+
+# project imports
+from .shoe import ACE
+
+# constants
+_NVALUES = 11
+_HARD_MAX = 31
+_NCARDS_MAX = 3
+
+
+def _encode(hard, ace, ncards, pair):
+    return (((ncards * (_HARD_MAX + 1) + hard) * 2 + ace) * 2 + pair) \
+        * _NVALUES
+
+
+def _decode(state):
+    state //= _NVALUES
+    pair = state % 2
+    state //= 2
+    ace = state % 2
+    state //= 2
+    return state % (_HARD_MAX + 1), ace, state // (_HARD_MAX + 1), pair
+
+
+# exported constants
+EMPTY = _encode(0, 0, 0, 0)
+NSTATES = (_NCARDS_MAX + 1) * (_HARD_MAX + 1) * 4
+STATES = tuple(s * _NVALUES for s in range(NSTATES))
+
+
+def _build():
+    size = NSTATES * _NVALUES
+    transition = [EMPTY] * size
+    score = [0] * size
+    soft = [False] * size
+    busted = [False] * size
+    blackjack = [False] * size
+    pair = [0] * size
+    for state in STATES:
+        hard, ace, ncards, is_pair = _decode(state)
+        is_soft = ace == 1 and hard + 10 <= 21
+        score[state] = hard + 10 if is_soft else hard
+        soft[state] = is_soft
+        busted[state] = hard > 21
+        blackjack[state] = ncards == 2 and ace == 1 and hard == 11
+        if is_pair:
+            pair[state] = hard // 2
+        for value in range(ACE, _NVALUES):
+            transition[state + value] = _encode(
+                min(hard + value, _HARD_MAX),
+                1 if ace or value == ACE else 0,
+                min(ncards + 1, _NCARDS_MAX),
+                1 if ncards == 1 and value == hard else 0
+            )
+    return (transition, score, soft, busted, blackjack, pair)
+
+
+TRANSITION, SCORE, SOFT, BUSTED, BLACKJACK, PAIR = _build()
+
+
+def hand_state(cards):
+    state = EMPTY
+    for card in cards:
+        state = TRANSITION[state + card]
+    return state
@@ -0,0 +1,169 @@
+"""
+Binary hand history. Every hand of a recorded game is stored as one fixed
+size record of packed little-endian integers: the simulation and game, the
+seat (255 for the dealer), the hand number (0 unless the hand came from a
+split, otherwise its place in the order of play), the final action, the
+wager, result and bankroll after the hand, and the cards of the hand packed
+two to a byte.
+
+The writer has the interface of RecordLog, so recordings are streamed and
+appended by worker processes in the same way. The reader memory-maps the
+file as a NumPy structured array, so a recording of any size can be scanned
+with vectorized operations without being loaded.
+"""
+
+# system imports
+import os
+import struct
+
+try:
+    import fcntl
+except ImportError:     # appends rely on the atomicity of a single write
+    fcntl = None
+
+# project imports
+from .config import PLAYER_NAME_KEY
+from .recorder import RECORDER_PLAYERS_KEY, RECORDER_DEALER_KEY, \
+    RECORDER_PLAYER_WAGER_KEY, RECORDER_PLAYER_HAND_KEY, \
+    RECORDER_PLAYER_ACTION_KEY, RECORDER_PLAYER_ACTION_TYPE_KEY, \
+    RECORDER_PLAYER_ACTION_HIT, RECORDER_PLAYER_ACTION_STAND, \
+    RECORDER_PLAYER_ACTION_DOUBLE_DOWN, RECORDER_PLAYER_ACTION_SPLIT, \
+    RECORDER_PLAYER_ACTION_SURRENDER, RECORDER_PLAYER_ACTION_DRAW_KEY, \
+    RECORDER_PLAYER_ACTION_SPLITS_KEY, RECORDER_PLAYER_RESULT_KEY, \
+    RECORDER_PLAYER_BANKROLL_KEY, RECORDER_DEALER_HAND_KEY, \
+    RECORDER_DEALER_DRAW_KEY, write_all
+from .shoe import ACE
+
+# exported constants
+HISTORY_SUFFIX = '.hands'
+HISTORY_DEALER_SEAT = 255
+HISTORY_ACTION_STAND = 0
+HISTORY_ACTION_HIT = 1
+HISTORY_ACTION_DOUBLE_DOWN = 2
+HISTORY_ACTION_SURRENDER = 3
+HISTORY_CARDS_MAX = 22
+HISTORY_FIELDS = [
+    ('simulation', '<u4'),
+    ('game', '<u4'),
+    ('seat', 'u1'),
+    ('hand', 'u1'),
+    ('action', 'u1'),
+    ('ncards', 'u1'),
+    ('wager', '<i4'),
+    ('result', '<i4'),
+    ('bankroll', '<i8'),
+    ('cards', 'u1', (HISTORY_CARDS_MAX // 2,))
+]
+
+# constants
+_MAGIC = b'sim21hh\0'
+_VERSION = 1
+_HEADER = struct.Struct('<8sII')    # magic, version, record size
+_RECORD = struct.Struct('<IIBBBBiiq%ds' % (HISTORY_CARDS_MAX // 2))
+_BLOCK_SIZE = 1 << 20
+_ACTIONS = {
+    None: HISTORY_ACTION_STAND,
+    RECORDER_PLAYER_ACTION_STAND: HISTORY_ACTION_STAND,
+    RECORDER_PLAYER_ACTION_HIT: HISTORY_ACTION_HIT,
+    RECORDER_PLAYER_ACTION_DOUBLE_DOWN: HISTORY_ACTION_DOUBLE_DOWN,
+    RECORDER_PLAYER_ACTION_SURRENDER: HISTORY_ACTION_SURRENDER
+}
+
+
+class HandLog(object):
+
+    def __init__(self, rfile, config, truncate=False):
+        self.seats = {c[PLAYER_NAME_KEY]: i
+                      for i, c in enumerate(config.player_configs())}
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        if truncate:
+            flags |= os.O_TRUNC
+        self.fd = os.open(rfile, flags, 0o644)
+        if truncate:
+            write_all(self.fd, _HEADER.pack(_MAGIC, _VERSION, _RECORD.size))
+        self.records = []
+        self.size = 0
+
+    def write(self, simulation, game, record):
+        for name, player in record[RECORDER_PLAYERS_KEY].items():
+            # a seat sitting the round out has no hand
+            if player[RECORDER_PLAYER_WAGER_KEY] == 0:
+                continue
+            self._write_hands(simulation, game, self.seats[name],
+                              player[RECORDER_PLAYER_WAGER_KEY], player, 0)
+        dealer = record[RECORDER_DEALER_KEY]
+        self._write(simulation, game, HISTORY_DEALER_SEAT, 0,
+                    HISTORY_ACTION_STAND,
+                    dealer[RECORDER_DEALER_HAND_KEY]
+                    + dealer[RECORDER_DEALER_DRAW_KEY], 0, 0, 0)
+        if self.size >= _BLOCK_SIZE:
+            self.flush()
+
+    def _write_hands(self, simulation, game, seat, wager, record, hand):
+        # split hands are numbered from 1 depth first, which is the order of
+        # play; returns the number of the next hand
+        action = record[RECORDER_PLAYER_ACTION_KEY]
+        action_type = action.get(RECORDER_PLAYER_ACTION_TYPE_KEY)
+        if action_type == RECORDER_PLAYER_ACTION_SPLIT:
+            hand = max(hand, 1)
+            for split in action[RECORDER_PLAYER_ACTION_SPLITS_KEY]:
+                hand = self._write_hands(simulation, game, seat, wager, split,
+                                         hand)
+            return hand
+        self._write(simulation, game, seat, hand, _ACTIONS[action_type],
+                    record[RECORDER_PLAYER_HAND_KEY]
+                    + action.get(RECORDER_PLAYER_ACTION_DRAW_KEY, []),
+                    wager, record[RECORDER_PLAYER_RESULT_KEY],
+                    record[RECORDER_PLAYER_BANKROLL_KEY])
+        return hand + 1
+
+    def _write(self, simulation, game, seat, hand, action, cards, wager,
+               result, bankroll):
+        values = [ACE if c == 'A' else c for c in cards]
+        if len(values) % 2:
+            values.append(0)
+        packed = bytes(values[i] | values[i + 1] << 4
+                       for i in range(0, len(values), 2))
+        self.records.append(_RECORD.pack(simulation, game, seat, hand,
+                                         action, len(cards), wager, result,
+                                         bankroll, packed))
+        self.size += _RECORD.size
+
+    def flush(self):
+        if self.records:
+            # locked so a partial write is never interleaved with records
+            # appended by other processes
+            if fcntl is not None:
+                fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                write_all(self.fd, b''.join(self.records))
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self.fd, fcntl.LOCK_UN)
+            self.records = []
+            self.size = 0
+
+    def close(self):
+        self.flush()
+        os.close(self.fd)
+
+
+def read_hands(rfile):
+    import numpy as np
+    dtype = np.dtype(HISTORY_FIELDS)
+    with open(rfile, 'rb') as f:
+        magic, version, size = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != _MAGIC or version != _VERSION or size != dtype.itemsize:
+        raise ValueError("'%s' is not a hand history" % rfile)
+    if os.path.getsize(rfile) == _HEADER.size:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(rfile, dtype=dtype, mode='r', offset=_HEADER.size)
+
+
+def hand_cards(hands):
+    import numpy as np
+    packed = hands['cards']
+    cards = np.empty((len(hands), HISTORY_CARDS_MAX), dtype=np.uint8)
+    cards[:, 0::2] = packed & 0x0f
+    cards[:, 1::2] = packed >> 4
+    return cards
@@ -0,0 +1,317 @@
+"""
+Index generator. For every deviation of the given files, shuffled shoes are
+dealt down as in a game and before each round the deviation's cards and
+dealer upcard are swapped into place from the unseen cards, rather than
+waiting for them to come up. The round is played out twice from the same
+cards, once with the deviation's action and once without it, and the swaps
+are undone so the cards seen stay in random order. The difference of the two
+outcomes is binned by the true count at the decision, and the index is where
+a least squares line through the bins, weighted by their hands, crosses zero.
+
+Hands are played by the rules of Game. Only the first decision of the hand is
+forced, the base chart makes every other decision. Hard totals are dealt as a
+ten and the rest (or as the rest and a two up to 11), soft totals as an ace
+and the rest. The deviations are evaluated in parallel.
+"""
+
+# system imports
+from array import array
+import json
+import math
+import multiprocessing
+import sys
+import traceback
+
+# 3rd party imports
+import tabulate
+from tqdm import tqdm
+
+# project imports
+from .cmdline import parse_indices_cmdline
+from .config import Config, GAME_SURRENDER_NONE, GAME_SURRENDER_LATE
+from .counts import COUNT_SYSTEMS, DECK_CARDS
+from .game import dealer_strategy
+from .hand import EMPTY, TRANSITION, SCORE, SOFT, BUSTED, BLACKJACK, PAIR
+from .rng import root_seed, simulation_rng
+from .shoe import ACE, Deck
+from .strategies import Soft17
+from .strategies.chart import load_chart, CHART_HARD_KEY, CHART_SOFT_KEY, \
+    CHART_PAIR_KEY, parse_total
+from .strategies.deviation import read_deviations, DEVIATIONS_KEY, ACTIONS
+
+# constants
+_COUNT_RANGE = 10     # true counts are binned from -10 to 10
+
+
+def main(argv=sys.argv):
+    try:
+        args = parse_indices_cmdline(argv)
+        _indices(args)
+    except Exception as e:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def _indices(args):
+    deviations = read_deviations(tuple(args.deviations))
+    if args.system not in COUNT_SYSTEMS:
+        raise ValueError("unknown count system: %s" % args.system)
+    seed = root_seed(args.seed)
+    tasks = [(args.cfile, args.chart, args.system, deviation, args.trials,
+              seed, i) for i, deviation in enumerate(deviations)]
+    if args.jobs == 1:
+        results = map(_cell_worker, tasks)
+        indices = list(tqdm(results, total=len(tasks), disable=args.quiet))
+    else:
+        with multiprocessing.Pool(args.jobs) as pool:
+            indices = list(tqdm(pool.imap(_cell_worker, tasks),
+                                total=len(tasks), disable=args.quiet))
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump({DEVIATIONS_KEY: [
+                _deviation(deviation, index)
+                for deviation, index in zip(deviations, indices)
+                if index is not None
+            ]}, f, indent=2)
+    if not args.quiet:
+        table = []
+        for deviation, index in zip(deviations, indices):
+            table.append([deviation['hand'], deviation['total'],
+                          deviation['upcard'], deviation['action'],
+                          _index_text(deviation),
+                          '-' if index is None else _index_text(
+                              _deviation(deviation, index))])
+        print(tabulate.tabulate(table, headers=['Hand', 'Total', 'Upcard',
+                                                'Action', 'Given',
+                                                'Simulated']))
+
+
+def _deviation(deviation, index):
+    above, value = index
+    result = {k: v for k, v in deviation.items()
+              if k not in ('above', 'below')}
+    result['above' if above else 'below'] = value
+    return result
+
+
+def _index_text(deviation):
+    if 'above' in deviation:
+        return '>= %d' % deviation['above']
+    return '< %d' % deviation['below']
+
+
+def _cell_worker(task):
+    cfile, chart, system, deviation, trials, seed, index = task
+    cell = IndexCell(Config(cfile), load_chart(chart), system, deviation)
+    cell.run(trials, simulation_rng(seed, index))
+    return cell.index()
+
+
+def _cards(hand, total):
+    if hand == CHART_PAIR_KEY:
+        return total, total
+    if hand == CHART_SOFT_KEY:
+        return ACE, total - 11
+    if hand != CHART_HARD_KEY:
+        raise ValueError("invalid deviation hand: %s" % hand)
+    if total > 11:
+        return 10, total - 10
+    return total - 2, 2
+
+
+class IndexCell(object):
+
+    def __init__(self, config, tables, system, deviation):
+        action = deviation.get('action')
+        if action not in ACTIONS:
+            raise ValueError("invalid deviation action: %s" % action)
+        self.decision, self.value = ACTIONS[action]
+        self.surrender = config.surrender
+        if self.decision == 'surrender' \
+           and self.surrender == GAME_SURRENDER_NONE:
+            raise ValueError("surrender deviations need a surrender rule")
+        self.tables = tables
+        self.das = config.DAS
+        self.maxhands = config.maxhands
+        self.soft17 = isinstance(dealer_strategy(config), Soft17)
+        self.reshuffle = config.reshuffle
+        self.tags = COUNT_SYSTEMS[system]
+        self.cards = array('b', config.shoe * Deck.values)
+        self.ncards = len(self.cards)
+        self.upcard = parse_total(deviation['upcard'])
+        self.deal = _cards(deviation['hand'],
+                           parse_total(deviation['total']))
+        self.state = TRANSITION[TRANSITION[EMPTY + self.deal[0]]
+                                + self.deal[1]]
+        self.hands = [0] * (2 * _COUNT_RANGE + 1)
+        self.counts = [0.0] * (2 * _COUNT_RANGE + 1)
+        self.differences = [0.0] * (2 * _COUNT_RANGE + 1)
+
+    def run(self, trials, rng):
+        # rounds are dealt down shuffled shoes as in a game, and before each
+        # one the deviation's cards are swapped into place from the unseen
+        # cards, and swapped back after it so the shoe stays in random order
+        cards = self.cards
+        tags = self.tags
+        ncards = self.ncards
+        # a continuous shuffling machine deals every round from a full shoe
+        depth = max(1, int(ncards * self.reshuffle))
+        order = (self.deal[0], self.upcard, self.deal[1])
+        needed = [order.count(v) for v in range(11)]
+        dealt = sum(tags[v] for v in order)
+        n = 0
+        while n < trials:
+            rng.shuffle(cards)
+            remaining = [cards.count(v) for v in range(11)]
+            running = 0
+            pointer = 0
+            while pointer < depth and n < trials \
+                    and all(remaining[v] >= needed[v] for v in order):
+                swaps = []
+                for place, value in enumerate(order, pointer):
+                    # a random unseen card of the value is dealt next
+                    i = rng.randrange(place, ncards)
+                    while cards[i] != value:
+                        i = rng.randrange(place, ncards)
+                    cards[place], cards[i] = cards[i], cards[place]
+                    swaps.append((place, i))
+                start = pointer + len(order)
+                count = (running + dealt) * DECK_CARDS / (ncards - start)
+                difference = self._outcome(start, self.value)
+                end = self.pointer
+                difference -= self._outcome(start, not self.value)
+                end = max(end, self.pointer)
+                b = min(max(math.floor(count), -_COUNT_RANGE),
+                        _COUNT_RANGE) + _COUNT_RANGE
+                self.hands[b] += 1
+                self.counts[b] += count
+                self.differences[b] += difference
+                n += 1
+                for place, i in reversed(swaps):
+                    cards[place], cards[i] = cards[i], cards[place]
+                for card in cards[pointer:end]:
+                    remaining[card] -= 1
+                    running += tags[card]
+                pointer = end
+
+    def index(self):
+        # where the weighted least squares line of the difference against
+        # the true count crosses zero, and whether the action pays above it
+        n = sum(self.hands)
+        if n == 0:
+            return None
+        mean_count = sum(self.counts) / n
+        mean_difference = sum(self.differences) / n
+        sxx = sxy = 0.0
+        for hands, counts, differences in zip(self.hands, self.counts,
+                                              self.differences):
+            if hands:
+                x = counts / hands - mean_count
+                sxx += hands * x * x
+                sxy += x * (differences - hands * mean_difference)
+        if sxx == 0.0 or sxy == 0.0:
+            return None
+        slope = sxy / sxx
+        root = mean_count - mean_difference / slope
+        if abs(root) > _COUNT_RANGE:
+            return None
+        return slope > 0, round(root)
+
+    def _draw(self):
+        card = self.cards[self.pointer]
+        self.pointer += 1
+        return card
+
+    def _outcome(self, pointer, value):
+        # outcome in units of the wager with the first decision forced
+        self.pointer = pointer
+        hole = self._draw()
+        dealer = TRANSITION[TRANSITION[EMPTY + self.upcard] + hole]
+        if self.surrender == GAME_SURRENDER_LATE and BLACKJACK[dealer]:
+            # the dealer peeks and the decision is never made
+            return -1.0
+        if self.decision == 'surrender' and value:
+            return -0.5
+        hands = self._play(self.decision, value)
+        outcome = 0.0
+        standing = []
+        for state, units in hands:
+            if BUSTED[state]:
+                outcome -= units
+            else:
+                standing.append((state, units))
+        if not standing:
+            return outcome
+        while True:
+            score = SCORE[dealer]
+            if not (score < 17 or (score == 17 and self.soft17
+                                   and SOFT[dealer])):
+                break
+            dealer = TRANSITION[dealer + self._draw()]
+            if BUSTED[dealer]:
+                return outcome + sum(units for _, units in standing)
+        for state, units in standing:
+            if BLACKJACK[dealer] or SCORE[state] < SCORE[dealer]:
+                outcome -= units
+            elif SCORE[state] > SCORE[dealer]:
+                outcome += units
+        return outcome
+
+    def _play(self, decision, value):
+        # plays the hands in the order of Game, a split hand is played right
+        # after the hand it was split from
+        tables = self.tables
+        upcard = self.upcard
+        states = [self.state]
+        firsts = [self.deal[0]]
+        results = []
+        i = 0
+        while i < len(states):
+            state = states[i]
+            force = i == 0
+            units = 1
+            while True:
+                split_game = len(states) > 1
+                index = state + upcard
+                if split_game and not self.das:
+                    double = False
+                elif force and decision == 'doubledown':
+                    double = value
+                elif force and (decision == 'hit'
+                                or (decision == 'split' and value)):
+                    # doubling would preempt the forced decision
+                    double = False
+                else:
+                    double = tables.doubledown[index]
+                if double:
+                    state = TRANSITION[state + self._draw()]
+                    units = 2
+                    break
+                if force and decision == 'split':
+                    split = value
+                else:
+                    split = tables.split[index] and not (force
+                                                        and decision == 'hit')
+                if split and PAIR[state] and len(states) != self.maxhands:
+                    card = PAIR[state]
+                    start = TRANSITION[EMPTY + card]
+                    state = states[i] = TRANSITION[start + self._draw()]
+                    states.insert(i + 1, TRANSITION[start + self._draw()])
+                    firsts.insert(i + 1, card)
+                    force = False
+                    continue
+                aces = split_game and firsts[i] == ACE
+                if force and decision == 'hit':
+                    hit = value
+                else:
+                    hit = tables.hit[index]
+                while hit and not aces:
+                    state = TRANSITION[state + self._draw()]
+                    if BUSTED[state]:
+                        break
+                    hit = tables.hit[state + upcard]
+                break
+            results.append((state, units))
+            i += 1
+        return results
@@ -0,0 +1,193 @@
+"""
+Expected value oracle for composition-dependent play. For a player's hand,
+the dealer upcard and the cards left in the shoe, the oracle computes the
+expected values of standing, hitting, doubling, splitting and surrendering.
+The dealer's final totals are computed exactly over the shoe, and the player's
+draws deplete it as they are made, by the recursion of the chart generator.
+
+Values are keyed on the player's cards, the upcard and a bucket of the shoe:
+the share of every card value rounded to a multiple of 1/resolution and the
+decks left. Each bucket is computed once, from a shoe of those decks with
+those shares, and kept in a least recently used cache of a bounded size that
+can persist between runs. Oracles are shared by every game of a process, and
+the lookups and hits since they were last collected are reported with the
+simulation statistics. A cache file is saved once by every process at the end
+of a run, merged under a lock with what other processes saved to it.
+"""
+
+# system imports
+import collections
+import contextlib
+import os
+import pickle
+import threading
+
+try:
+    import fcntl
+except ImportError:     # saves are not serialized between processes
+    fcntl = None
+
+# project imports
+from .config import GAME_SURRENDER_LATE
+from .counts import DECK_CARDS
+from .game import dealer_strategy
+from .hand import PAIR, hand_state
+from .probability import SPLIT_HANDS_MAX, DealerTotals, PlayerValues
+from .stats import OracleStats
+from .strategies import Soft17
+
+# exported constants
+ORACLE_STAND = 0
+ORACLE_HIT = 1
+ORACLE_DOUBLE = 2
+ORACLE_SPLIT = 3
+ORACLE_SURRENDER = 4
+
+# constants
+_SURRENDER = -0.5
+_ORACLES = {}
+_ORACLES_LOCK = threading.Lock()
+
+
+def get_oracle(config, resolution, maxsize, path=None):
+    # one oracle per rule set and bucketing in a process
+    key = (isinstance(dealer_strategy(config), Soft17), config.DAS,
+           config.maxhands, config.surrender, resolution, maxsize, path)
+    with _ORACLES_LOCK:
+        oracle = _ORACLES.get(key)
+        if oracle is None:
+            oracle = _ORACLES[key] = EVOracle(config, resolution, maxsize,
+                                              path)
+        return oracle
+
+
+def collect_oracles():
+    # the lookups since the last collection
+    with _ORACLES_LOCK:
+        oracles = list(_ORACLES.values())
+    return {oracle.name: oracle.collect() for oracle in oracles}
+
+
+def save_oracles():
+    # called once by every process at the end of a run
+    with _ORACLES_LOCK:
+        oracles = list(_ORACLES.values())
+    for oracle in oracles:
+        oracle.save()
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    with open(path + '.lock', 'w') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+class EVOracle(object):
+
+    def __init__(self, config, resolution, maxsize, path=None):
+        if resolution < 1 or DECK_CARDS % resolution:
+            raise ValueError("oracle resolution must divide %d"
+                             % DECK_CARDS)
+        self.das = config.DAS
+        self.maxhands = config.maxhands or SPLIT_HANDS_MAX
+        self.peek = config.surrender == GAME_SURRENDER_LATE
+        self.soft17 = isinstance(dealer_strategy(config), Soft17)
+        self.resolution = resolution
+        self.maxsize = maxsize
+        self.path = path
+        self.name = 'resolution %d' % resolution
+        if path is not None:
+            self.name += ', %s' % path
+        self.lock = threading.Lock()
+        self.cache = collections.OrderedDict()
+        self.lookups = 0
+        self.hits = 0
+        self.dirty = False
+        if path is not None and os.path.exists(path):
+            with open(path, 'rb') as f:
+                self.cache.update(pickle.load(f))
+            while len(self.cache) > maxsize:
+                self.cache.popitem(last=False)
+
+    def values(self, hand, upcard, counts):
+        # expected values indexed by ORACLE_STAND ... ORACLE_SURRENDER, None
+        # where the decision cannot be made
+        unseen = counts.unseen
+        decks = max(1, round(unseen / DECK_CARDS))
+        shares = tuple(round(n * self.resolution / unseen)
+                       for n in counts.remaining)
+        key = (tuple(sorted(hand)), upcard, decks, shares)
+        with self.lock:
+            self.lookups += 1
+            values = self.cache.get(key)
+            if values is not None:
+                self.hits += 1
+                self.cache.move_to_end(key)
+                return values
+        scale = decks * (DECK_CARDS // self.resolution)
+        values = _Values(self, upcard, tuple(n * scale for n in shares)) \
+            .values(hand)
+        with self.lock:
+            self.cache[key] = values
+            self.dirty = True
+            if len(self.cache) > self.maxsize:
+                self.cache.popitem(last=False)
+        return values
+
+    def collect(self):
+        with self.lock:
+            stats = OracleStats(self.lookups, self.hits, len(self.cache))
+            self.lookups = self.hits = 0
+        return stats
+
+    def save(self):
+        with self.lock:
+            if self.path is None or not self.dirty:
+                return
+            self.dirty = False
+            items = list(self.cache.items())
+        with _file_lock(self.path):
+            # the values saved by other processes are kept, behind ours
+            cache = collections.OrderedDict()
+            if os.path.exists(self.path):
+                with open(self.path, 'rb') as f:
+                    cache.update(pickle.load(f))
+            for key, values in items:
+                cache[key] = values
+                cache.move_to_end(key)
+            while len(cache) > self.maxsize:
+                cache.popitem(last=False)
+            # written aside and renamed, so a reader never sees a partial
+            # cache
+            partial = '%s.%d' % (self.path, os.getpid())
+            with open(partial, 'wb') as f:
+                pickle.dump(list(cache.items()), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(partial, self.path)
+
+
+class _Values(PlayerValues):
+
+    def __init__(self, oracle, upcard, comp):
+        final, blackjack = DealerTotals(oracle.soft17).probabilities(upcard,
+                                                                     comp)
+        super().__init__(final, blackjack, oracle.das, oracle.maxhands,
+                         oracle.peek)
+        self.comp = comp
+
+    def values(self, hand):
+        state = hand_state(hand)
+        comp = self.comp
+        values = [None] * (ORACLE_SURRENDER + 1)
+        values[ORACLE_STAND] = self.overall(self.stand(state), 1.0)
+        values[ORACLE_HIT] = self.overall(self.hit(state, comp), 1.0)
+        if len(hand) == 2:
+            values[ORACLE_DOUBLE] = self.overall(self.double(state, comp),
+                                                 2.0)
+            if PAIR[state]:
+                values[ORACLE_SPLIT] = self.overall(
+                    *self.split(PAIR[state], comp))
+            # half the wager is lost whether the dealer has a blackjack or not
+            values[ORACLE_SURRENDER] = _SURRENDER
+        return tuple(values)
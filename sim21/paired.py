@@ -0,0 +1,82 @@
+"""
+Paired simulation with common random numbers. Every configured player sits
+alone at a table of its own, and all tables are dealt from one shoe that is
+rewound before each table plays a round, so in every round the strategies
+see the same cards. The shoe then moves past the last card any table used,
+and so do its counts when the shoe is observed. The outcome of each player in
+a round is compared with the first player to give paired differences whose
+variance is much smaller than that of separate simulations.
+"""
+
+# project imports
+from .config import PLAYER_NAME_KEY
+from .game import Game
+from .rng import root_seed, simulation_rng
+from .shoe import Shoe
+from .stats import PairedStats
+
+
+class PairedGame(object):
+
+    def __init__(self, config, seed=None, index=0):
+        self.config = config
+        self.seed = root_seed(seed)
+        self.shoe = Shoe(config.shoe, simulation_rng(self.seed, index))
+        player_configs = config.player_configs()
+        self.games = [Game(None, config, self.seed, index, self.shoe, [c])
+                      for c in player_configs]
+        self.names = [c[PLAYER_NAME_KEY] for c in player_configs]
+        self._reset_pairs()
+
+    def _reset_pairs(self):
+        self.pairs = {(name, self.names[0]): PairedStats()
+                      for name in self.names[1:]}
+
+    def reset(self, index):
+        for game in self.games:
+            game.reset(index)
+        self._reset_pairs()
+
+    @property
+    def players(self):
+        for game in self.games:
+            yield from game.players
+
+    def play(self, ngame):
+        self.shoe.shuffle()
+        for _ in range(ngame):
+            games = [g for g in self.games if not g.all_done()]
+            if len(games) == 0:
+                break
+            if self.shoe.position() > self.config.reshuffle:
+                self.shoe.shuffle()
+            start = end = self.shoe.pointer
+            counts = self.shoe.counts
+            if counts is not None:
+                state = final = counts.save()
+            outcomes = {}
+            for game in games:
+                self.shoe.pointer = start
+                if counts is not None:
+                    counts.restore(state)
+                player = next(iter(game.players))
+                bankroll = int(player.bankroll)
+                game.play_round()
+                outcomes[game] = int(player.bankroll) - bankroll
+                if self.shoe.pointer > end:
+                    end = self.shoe.pointer
+                    if counts is not None:
+                        final = counts.save()
+            self.shoe.pointer = end
+            if counts is not None:
+                counts.restore(final)
+            self._add_pairs(outcomes)
+
+    def _add_pairs(self, outcomes):
+        reference = self.games[0]
+        if reference not in outcomes:
+            return
+        for game, name in zip(self.games[1:], self.names[1:]):
+            if game in outcomes:
+                self.pairs[(name, self.names[0])].add_game(
+                    outcomes[game] - outcomes[reference])
@@ -6,68 +6,40 @@ Simulation of a player.
 from enum import Enum
 
 # project imports
-from .shoe import Rank
+from .hand import EMPTY, TRANSITION, SCORE, SOFT, BUSTED, BLACKJACK, PAIR, \
+    hand_state
+from .shoe import ACE
 from .stats import PlayerStats
 
 
-class HandType(Enum):
-    Soft = 0
-    Hard = 1
-
-
 class BasePlayer(object):
 
     def __init__(self):
         self.hand = []
-        self.hand_divided = False
+        self.state = EMPTY
 
     def receive(self, card):
         self.hand.append(card)
-        self.hand_divided = False
+        self.state = TRANSITION[self.state + card]
 
     def close_hand(self):
         del self.hand[:]
-        self.hand_divided = False
+        self.state = EMPTY
 
     def blackjack(self):
-        return len(self.hand) == 2 and self._score(HandType.Soft) == 21
+        return BLACKJACK[self.state]
 
     def busted(self):
-        return self._score(HandType.Hard) > 21
+        return BUSTED[self.state]
 
     def is_soft(self):
-        value, num_aces = self._divide_hand()
-        if num_aces == 0:
-            return False
-        return value + 10 + num_aces <= 21
+        return SOFT[self.state]
 
     def score(self):
-        score = self._score(HandType.Soft)
-        if score > 21:
-            return self._score(HandType.Hard)
-        else:
-            return score
-
-    def _score(self, hand_type):
-        value, num_aces = self._divide_hand()
-        if num_aces == 0:
-            return value
-        if hand_type is HandType.Soft:
-            return value + 10 + num_aces
-        else:
-            return value + num_aces
+        return SCORE[self.state]
 
-    def _divide_hand(self):
-        if not self.hand_divided:
-            self.num_aces = 0
-            self.value = 0
-            for card in self.hand:
-                if card.rank is Rank.Ace:
-                    self.num_aces += 1
-                else:
-                    self.value += card.value
-            self.hand_divided = True
-        return self.value, self.num_aces
+    def pair(self):
+        return PAIR[self.state]
 
 
 class Dealer(BasePlayer):
@@ -126,7 +98,9 @@ class PlayerType(Enum):
 
 class Player(BasePlayer):
 
-    c_config = None
+    config = None
+    table = None
+    seat = None
 
     def __init__(self, name, bankroll, betting_strategy, playing_strategy,
                  player_type=PlayerType.Primary, hand_count=None, stats=None):
@@ -165,7 +139,7 @@ class Player(BasePlayer):
         self.hand_count.count = 1
 
     def is_bankrolled(self):
-        return self.bankroll >= self.c_config.minimum
+        return self.bankroll >= self.config.minimum
 
     def is_playing(self):
         return self.wager > 0
@@ -173,10 +147,13 @@ class Player(BasePlayer):
     def place_bet(self):
         self.wager = self.betting_strategy.get_wager(self)
         self.bankroll -= self.wager
-        self.stats.games += 1
+        # a wager of 0 sits the round out, which is not a game played
+        if self.wager > 0:
+            self.stats.games += 1
+            self.table.active += 1
 
     def doubledown(self):
-        if self.split_game and not self.c_config.DAS:
+        if self.split_game and not self.config.DAS:
             return False
         if self.bankroll < self.wager:
             return False
@@ -188,9 +165,9 @@ class Player(BasePlayer):
         return dd
 
     def split(self):
-        if self.hand[0].value != self.hand[1].value:
+        if not self.pair():
             return False
-        if self.hand_count == self.c_config.maxhands:
+        if self.hand_count == self.config.maxhands:
             return False
         if self.bankroll < self.wager:
             return False
@@ -211,7 +188,7 @@ class Player(BasePlayer):
         return surrender
 
     def hit(self):
-        if self.split_game and self.hand[0].rank is Rank.Ace:
+        if self.split_game and self.hand[0] == ACE:
             return False
         return self.playing_strategy.hit(self)
 
@@ -222,40 +199,50 @@ class Player(BasePlayer):
             winnings = multiplier * self.wager
         self.bankroll += winnings + self.wager
         self.wager = 0
+        self.table.active -= 1
         self.close_hand()
         self.stats.wins += 1
+        self.stats.add_hand(winnings)
         return winnings
 
     def lose(self):
         wager = self.wager
         self.wager = 0
+        self.table.active -= 1
         self.close_hand()
         self.stats.loses += 1
+        self.stats.add_hand(-wager)
         return wager
 
     def push(self):
         self.bankroll += self.wager
         self.wager = 0
+        self.table.active -= 1
         self.close_hand()
         self.stats.pushes += 1
 
     def remove(self):
         card = self.hand[-1]
         del self.hand[-1]
-        self.hand_divided = False
+        self.state = hand_state(self.hand)
         return card
 
-    def clone(self, override=None):
-        if override is None:
-            cls = self.__class__
-        else:
-            cls = override
-        clone = cls(self.name, self.bankroll, self.betting_strategy,
-                    self.playing_strategy, player_type=PlayerType.Split,
-                    hand_count=self.hand_count, stats=self.stats)
-        clone.receive(self.remove())
-        clone.wager = self.wager
-        clone.bankroll -= clone.wager
+    def split_slot(self):
+        # a hand for the splits of this player, sharing its seat, bankroll,
+        # hand count and stats
+        slot = self.__class__(self.name, self.bankroll, self.betting_strategy,
+                              self.playing_strategy,
+                              player_type=PlayerType.Split,
+                              hand_count=self.hand_count, stats=self.stats)
+        slot.config = self.config
+        slot.table = self.table
+        slot.seat = self.seat
+        return slot
+
+    def split_into(self, slot):
+        slot.receive(self.remove())
+        slot.wager = self.wager
+        slot.bankroll -= slot.wager
         self.split_game = True
-        clone.split_game = True
-        return clone
+        slot.split_game = True
+        self.table.active += 1
@@ -1,5 +1,9 @@
 """
 Manage all players in game. Players configured using JSON file.
+
+Players sit at a table of seats. Each seat keeps its hands in play order and
+a set of preallocated split hands sized from the maxhands rule, and the table
+keeps counts of the hands still in play and of the seats that can still bet.
 """
 
 # system imports
@@ -9,77 +13,120 @@ import importlib
 # project imports
 from .config import PLAYER_NAME_KEY, PLAYER_STRATEGIES_KEY, \
     STRATEGY_BETTING_KEY, STRATEGY_PLAYING_KEY, STRATEGY_CLASS_KEY, \
-    STRATEGY_ARGS_KEY, PLAYER_WAGERS_KEY
-from .player import Player, PlayerType
+    STRATEGY_ARGS_KEY, PLAYER_WAGERS_KEY, GAME_MAXHANDS_UNLIMITED
+from .player import Player
 from .recorder import PlayerRecorder
 
 # constants
 _PLAYER_WAGERS_DEFAULT = 100
+_SPLIT_SLOTS_UNLIMITED = 3
+
+
+def create_strategy(strategy_config):
+    mname, cls = strategy_config[STRATEGY_CLASS_KEY].split(':')
+    module = importlib.import_module(mname)
+    return getattr(module, cls)(*strategy_config.get(STRATEGY_ARGS_KEY, []))
+
+
+def player_bankroll(player_config, minimum):
+    return minimum * player_config.get(PLAYER_WAGERS_KEY,
+                                       _PLAYER_WAGERS_DEFAULT)
 
 
-class PlayerNode(object):
+class _Seat(object):
 
-    def __init__(self, player):
+    def __init__(self, player, nslots):
         self.player = player
-        self.next = None
+        player.seat = self
+        self.hands = [player]
+        self.slots = [player.split_slot() for _ in range(nslots)]
+        self.nsplits = 0
+        self.bankrolled = player.is_bankrolled()
 
 
 class Players(object):
 
-    def __init__(self, config, rfile):
-        Player.c_config = config
-        player_configs = config.player_configs()
-        self.players = PlayerNode(self._create_player(player_configs[0],
-                                                      config.minimum, rfile))
-        node = self.players
-        for player_config in player_configs[1:]:
-            node.next = PlayerNode(self._create_player(player_config,
-                                                       config.minimum, rfile))
-            node = node.next
+    def __init__(self, context, recording, player_configs=None):
+        config = context.config
+        if player_configs is None:
+            player_configs = config.player_configs()
+        if config.maxhands == GAME_MAXHANDS_UNLIMITED:
+            nslots = _SPLIT_SLOTS_UNLIMITED
+        else:
+            nslots = config.maxhands - 1
+        self.active = 0
+        self.seats = []
+        for player_config in player_configs:
+            player = self._create_player(player_config, context, recording)
+            player.config = config
+            player.table = self
+            self.seats.append(_Seat(player, nslots))
+        self.bankrolled = sum(seat.bankrolled for seat in self.seats)
+        self._split_seats = []
 
     def __iter__(self):
-        self.ptr = self.players
-        while self.ptr is not None:
-            yield self.ptr.player
-            self.ptr = self.ptr.next
+        for seat in self.seats:
+            yield from seat.hands
+
+    def bettors(self):
+        return (seat.player for seat in self.seats if seat.bankrolled)
 
-    def _create_player(self, player_config, minimum, rfile):
+    def _create_player(self, player_config, context, recording):
         strategies = player_config[PLAYER_STRATEGIES_KEY]
-        betting_strategy \
-            = self._create_strategy_object(strategies[STRATEGY_BETTING_KEY])
-        playing_strategy \
-            = self._create_strategy_object(strategies[STRATEGY_PLAYING_KEY])
-        bankroll = minimum * player_config.get(PLAYER_WAGERS_KEY,
-                                               _PLAYER_WAGERS_DEFAULT)
-        if rfile is None:
+        betting_strategy = create_strategy(strategies[STRATEGY_BETTING_KEY])
+        playing_strategy = create_strategy(strategies[STRATEGY_PLAYING_KEY])
+        betting_strategy.bind(context)
+        playing_strategy.bind(context)
+        bankroll = player_bankroll(player_config, context.config.minimum)
+        if recording is None:
             return Player(player_config[PLAYER_NAME_KEY], bankroll,
                           betting_strategy, playing_strategy)
         else:
-            return PlayerRecorder(player_config[PLAYER_NAME_KEY], bankroll,
-                                  betting_strategy, playing_strategy)
-
-    def _create_strategy_object(self, strategy_config):
-        mname, cls = strategy_config[STRATEGY_CLASS_KEY].split(':')
-        module = importlib.import_module(mname)
-        return getattr(module, cls)(*strategy_config.get(STRATEGY_ARGS_KEY,
-                                                         []))
-
-    def split(self, card1, card2):
-        curr = self.ptr
-        player = curr.player
-        clone = player.clone()
+            player = PlayerRecorder(player_config[PLAYER_NAME_KEY], bankroll,
+                                    betting_strategy, playing_strategy)
+            player.recording = recording
+            return player
+
+    def split(self, player, card1, card2):
+        # the new hand takes the next free slot of the seat and is played
+        # right after the hand it was split from
+        seat = player.seat
+        if seat.nsplits == len(seat.slots):
+            seat.slots.append(seat.player.split_slot())
+        if seat.nsplits == 0:
+            self._split_seats.append(seat)
+        slot = seat.slots[seat.nsplits]
+        seat.nsplits += 1
+        player.split_into(slot)
         player.receive(card1)
-        clone.receive(card2)
-        next = curr.next
-        curr.next = PlayerNode(clone)
-        curr.next.next = next
+        slot.receive(card2)
+        hands = seat.hands
+        hands.insert(hands.index(player) + 1, slot)
+
+    def reset(self):
+        for seat in self.seats:
+            player = seat.player
+            player.stats.reset()
+            player.bankroll.count = player.stats.bankroll
+            player.wager = 0
+            player.close_hand()
+            player.betting_strategy.reset()
+            player.playing_strategy.reset()
+            seat.bankrolled = player.is_bankrolled()
+        self.bankrolled = sum(seat.bankrolled for seat in self.seats)
+        self.active = 0
 
     def cleanup(self):
-        prev = self.players
-        curr = self.players.next
-        while curr is not None:
-            if curr.player.player_type is PlayerType.Split:
-                prev.next = curr.next
-            else:
-                prev = curr
-            curr = curr.next
+        for seat in self._split_seats:
+            for slot in seat.slots[:seat.nsplits]:
+                if slot.wager > 0:
+                    slot.wager = 0
+                    slot.close_hand()
+            del seat.hands[1:]
+            seat.nsplits = 0
+        del self._split_seats[:]
+        self.active = 0
+        for seat in self.seats:
+            if seat.bankrolled and not seat.player.is_bankrolled():
+                seat.bankrolled = False
+                self.bankrolled -= 1
@@ -0,0 +1,204 @@
+"""
+Exact probabilities over a shoe composition, shared by the house edge, the
+chart generator and the expected value oracle. A composition is a tuple of
+the number of cards of every value indexed by value, with an unused zero
+first. The dealer's final totals are computed by recursing through the hand
+states over the cards left, and the split hands of a pair by recursing
+through the resplits allowed by the maxhands limit. The expected values of
+the player's decisions against the dealer's final totals recurse through the
+hand states as the player draws, depleting the composition or, for a
+total-dependent chart, drawing from the same one throughout.
+"""
+
+# project imports
+from .hand import EMPTY, TRANSITION, SCORE, SOFT, BUSTED
+from .shoe import ACE
+
+# exported constants
+CARD_VALUES = range(ACE, 11)
+DEALER_TOTALS = (17, 18, 19, 20, 21)
+DEALER_BUST = len(DEALER_TOTALS)    # index of a bust in the final totals
+SPLIT_HANDS_MAX = 8     # the hands counted when maxhands is unlimited
+
+# constants
+_BLACKJACK_HOLE = {ACE: 10, 10: ACE}
+_STOOD = tuple(tuple(1.0 if i == j else 0.0 for j in range(DEALER_BUST + 1))
+               for i in range(DEALER_BUST + 1))
+
+
+def remove_card(comp, value):
+    return comp[:value] + (comp[value] - 1,) + comp[value + 1:]
+
+
+def split_hands(p, maxhands):
+    # expected numbers of split hands that are not a pair and of pairs left
+    # unsplit at the maxhands limit, when each new hand pairs with
+    # probability p
+    memo = {}
+
+    def count(hands, pending):
+        if pending == 0:
+            return 0.0, 0.0
+        key = (hands, pending)
+        if key not in memo:
+            other, pair = count(hands, pending - 1)
+            if hands < maxhands:
+                split_other, split_pair = count(hands + 1, pending + 1)
+                memo[key] = ((1 - p) * (1 + other) + p * split_other,
+                             (1 - p) * pair + p * split_pair)
+            else:
+                memo[key] = (other + 1 - p, pair + p)
+        return memo[key]
+
+    return count(2, 2)
+
+
+class DealerTotals(object):
+
+    def __init__(self, soft17):
+        self.soft17 = soft17
+        self.rounds = {}
+        self.cache = {}
+
+    def probabilities(self, upcard, comp):
+        # final totals given the dealer has no blackjack, and the
+        # probability of a blackjack
+        key = (upcard, comp)
+        result = self.rounds.get(key)
+        if result is None:
+            self.cache.clear()
+            hole = _BLACKJACK_HOLE.get(upcard, 0)
+            total = sum(comp) - comp[hole]
+            start = TRANSITION[EMPTY + upcard]
+            final = [0.0] * (DEALER_BUST + 1)
+            for v in CARD_VALUES:
+                if v == hole or comp[v] == 0:
+                    continue
+                p = comp[v] / total
+                final = [f + p * q for f, q in
+                         zip(final, self._final(TRANSITION[start + v],
+                                                remove_card(comp, v)))]
+            result = self.rounds[key] = final, comp[hole] / sum(comp)
+        return result
+
+    def _final(self, state, comp):
+        final = self.cache.get(comp)
+        if final is not None:
+            return final
+        score = SCORE[state]
+        if BUSTED[state]:
+            final = _STOOD[DEALER_BUST]
+        elif score > 17 or (score == 17
+                            and not (self.soft17 and SOFT[state])):
+            final = _STOOD[score - 17]
+        else:
+            final = [0.0] * (DEALER_BUST + 1)
+            total = sum(comp)
+            for v in CARD_VALUES:
+                n = comp[v]
+                if n:
+                    p = n / total
+                    final = [f + p * q for f, q in
+                             zip(final,
+                                 self._final(TRANSITION[state + v],
+                                             comp[:v] + (n - 1,)
+                                             + comp[v + 1:]))]
+        # within one round the cards left determine the dealer's hand
+        self.cache[comp] = final
+        return final
+
+
+class PlayerValues(object):
+
+    def __init__(self, final, blackjack, das, maxhands, peek, deplete=True):
+        self.final = final
+        self.blackjack = blackjack
+        self.das = das
+        self.maxhands = maxhands
+        self.peek = peek
+        self.deplete = deplete
+        self.draws = {}
+        self.cache = {}
+
+    def overall(self, ev, units):
+        # a dealer blackjack takes every unit wagered unless the dealer
+        # peeked before the decision
+        if self.peek:
+            return ev
+        return (1 - self.blackjack) * ev - self.blackjack * units
+
+    def stand(self, state):
+        score = SCORE[state]
+        final = self.final
+        ev = final[DEALER_BUST]
+        for total, p in zip(DEALER_TOTALS, final):
+            if score > total:
+                ev += p
+            elif score < total:
+                ev -= p
+        return ev
+
+    def hit(self, state, comp):
+        ev = 0.0
+        for v, p, left in self._draws(comp):
+            drawn = TRANSITION[state + v]
+            ev += p * (-1.0 if BUSTED[drawn] else self._best(drawn, left))
+        return ev
+
+    def double(self, state, comp):
+        ev = 0.0
+        for v, p, left in self._draws(comp):
+            drawn = TRANSITION[state + v]
+            ev += p * (-1.0 if BUSTED[drawn] else self.stand(drawn))
+        return 2 * ev
+
+    def split(self, value, comp):
+        # expected value and units of splitting, resplitting when it pays
+        start = TRANSITION[EMPTY + value]
+        aces = value == ACE
+        other = other_units = 0.0
+        p = pair_ev = pair_units = 0.0
+        for v, q, left in self._draws(comp):
+            ev, units = self._split_hand(TRANSITION[start + v], left, aces)
+            if v == value:
+                p, pair_ev, pair_units = q, ev, units
+            else:
+                other += q * ev
+                other_units += q * units
+        split = (2 * (other + p * pair_ev), 2 * (other_units + p * pair_units))
+        if self.maxhands == 2 or p == 0.0:
+            return split
+        nother, npair = split_hands(p, self.maxhands)
+        resplit = ((nother * other + npair * pair_ev * p) / (1 - p),
+                   (nother * other_units + npair * pair_units * p) / (1 - p))
+        return max(split, resplit, key=lambda option: self.overall(*option))
+
+    def _draws(self, comp):
+        # the cards drawn, their probabilities and the composition left
+        draws = self.draws.get(comp)
+        if draws is None:
+            total = sum(comp)
+            draws = self.draws[comp] = [
+                (v, comp[v] / total,
+                 remove_card(comp, v) if self.deplete else comp)
+                for v in CARD_VALUES if comp[v]]
+        return draws
+
+    def _best(self, state, comp):
+        # expected value of the hand after a hit, standing or hitting again
+        if SCORE[state] == 21:
+            return self.stand(state)
+        key = (state, comp)
+        ev = self.cache.get(key)
+        if ev is None:
+            ev = self.cache[key] = max(self.stand(state),
+                                       self.hit(state, comp))
+        return ev
+
+    def _split_hand(self, state, comp, aces):
+        # expected value and units of a split hand after its second card
+        options = [(self.stand(state) if aces else self._best(state, comp),
+                    1.0)]
+        if self.das:
+            options.append((self.double(state, comp), 2.0))
+        return max(options, key=lambda option: self.overall(*option))
@@ -1,18 +1,31 @@
 """
-Recorder classes for debugging and testing.
+Recorder classes for debugging and testing. Games are streamed as they
+finish into a single append-only log with one JSON object per line,
+optionally gzip compressed. Lines are written in blocks that each hold
+consecutive games of one simulation, and every block is listed in a small
+binary index next to the log, so a simulation or game can be read back
+without scanning the log.
 """
 
 # system imports
+import gzip
 import json
+import os
+import struct
+
+try:
+    import fcntl
+except ImportError:     # appends rely on the atomicity of a single write
+    fcntl = None
 
 # project imports
 from .player import Player, Dealer
-from .shoe import Rank
-
-# global variables
-_simulations = []
+from .shoe import ACE
 
 # constants
+RECORDER_SEED_KEY = 'seed'
+RECORDER_SIMULATION_KEY = 'simulation'
+RECORDER_GAME_KEY = 'game'
 RECORDER_PLAYERS_KEY = 'players'
 RECORDER_DEALER_KEY = 'dealer'
 RECORDER_PLAYER_WAGER_KEY = 'wager'
@@ -32,12 +45,138 @@ RECORDER_PLAYER_RESULT_KEY = 'result'
 RECORDER_PLAYER_BANKROLL_KEY = 'bankroll'
 RECORDER_DEALER_HAND_KEY = 'hand'
 RECORDER_DEALER_DRAW_KEY = 'draw'
+RECORDER_INDEX_SUFFIX = '.idx'
+_GZIP_SUFFIX = '.gz'
+_BLOCK_SIZE = 1 << 20
+_INDEX_RECORD = struct.Struct('<QQQQ')  # simulation, game, offset, length
+
+
+def write_all(fd, data):
+    # os.write may write only part of the data, the rest follows it
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+class RecordLog(object):
+
+    def __init__(self, rfile, truncate=False):
+        self.compress = rfile.endswith(_GZIP_SUFFIX)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        if truncate:
+            flags |= os.O_TRUNC
+        self.fd = os.open(rfile, flags, 0o644)
+        self.index_fd = os.open(rfile + RECORDER_INDEX_SUFFIX, flags, 0o644)
+        self.lines = []
+        self.size = 0
+        self.block = None
+
+    def write(self, simulation, game, record):
+        if self.block is not None and (self.block[0] != simulation
+                                       or self.size >= _BLOCK_SIZE):
+            self.flush()
+        if self.block is None:
+            self.block = (simulation, game)
+        line = json.dumps(record, separators=(',', ':')).encode() + b'\n'
+        self.lines.append(line)
+        self.size += len(line)
+
+    def flush(self):
+        if self.block is None:
+            return
+        data = b''.join(self.lines)
+        if self.compress:
+            data = gzip.compress(data)
+        # the log is locked so appends from several processes never
+        # interleave, even when a write is partial, and the file position
+        # after the block tells where it landed
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            write_all(self.fd, data)
+            offset = os.lseek(self.fd, 0, os.SEEK_CUR) - len(data)
+            write_all(self.index_fd, _INDEX_RECORD.pack(*self.block, offset,
+                                                        len(data)))
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.lines = []
+        self.size = 0
+        self.block = None
+
+    def close(self):
+        self.flush()
+        os.close(self.fd)
+        os.close(self.index_fd)
+
+
+def read_index(rfile):
+    with open(rfile + RECORDER_INDEX_SUFFIX, 'rb') as f:
+        return sorted(_INDEX_RECORD.iter_unpack(f.read()))
+
 
+def read_games(rfile, simulation):
+    blocks = [b for b in read_index(rfile) if b[0] == simulation]
+    with open(rfile, 'rb') as f:
+        for block in blocks:
+            for line in _read_block(rfile, f, block):
+                yield json.loads(line)
 
-def dump_simulations(rfile):
-    with open(rfile, 'w') as f:
-        json.dump(_simulations, f, indent=2)
-    del _simulations[:]
+
+def read_game(rfile, simulation, game):
+    blocks = [b for b in read_index(rfile)
+              if b[0] == simulation and b[1] <= game]
+    if len(blocks) == 0:
+        raise KeyError((simulation, game))
+    block = blocks[-1]
+    with open(rfile, 'rb') as f:
+        lines = _read_block(rfile, f, block)
+    if game - block[1] >= len(lines):
+        raise KeyError((simulation, game))
+    return json.loads(lines[game - block[1]])
+
+
+def _read_block(rfile, f, block):
+    f.seek(block[2])
+    data = f.read(block[3])
+    if rfile.endswith(_GZIP_SUFFIX):
+        data = gzip.decompress(data)
+    return data.splitlines()
+
+
+class Recording(object):
+
+    def __init__(self, log, seed, simulation):
+        self.log = log
+        self.seed = seed
+        self.simulation = simulation
+        self.count = 0
+        self.game = None
+
+    def reset(self, simulation):
+        self.simulation = simulation
+        self.count = 0
+        self.game = None
+
+    def start_game(self):
+        self.game = {
+            RECORDER_SEED_KEY: self.seed,
+            RECORDER_SIMULATION_KEY: self.simulation,
+            RECORDER_GAME_KEY: self.count,
+            RECORDER_PLAYERS_KEY: {},
+            RECORDER_DEALER_KEY: {
+                RECORDER_DEALER_HAND_KEY: [],
+                RECORDER_DEALER_DRAW_KEY: []
+            }
+        }
+
+    def end_game(self):
+        self.log.write(self.simulation, self.count, self.game)
+        self.count += 1
+        self.game = None
+
+    def close(self):
+        self.log.flush()
 
 
 def _bankroll(f):
@@ -51,29 +190,28 @@ def _bankroll(f):
 
 class PlayerRecorder(Player):
 
+    recording = None
+    record = None
+
     def place_bet(self):
         try:
             return super().place_bet()
         finally:
-            if len(_simulations) == 0 \
-               or self.name in _simulations[-1][RECORDER_PLAYERS_KEY]:
-                _simulations.append({
-                    RECORDER_PLAYERS_KEY: {},
-                    RECORDER_DEALER_KEY: {
-                        RECORDER_DEALER_HAND_KEY: [],
-                        RECORDER_DEALER_DRAW_KEY: []
-                    }
-                })
-            self.record = _simulations[-1][RECORDER_PLAYERS_KEY][self.name] \
-                = {RECORDER_PLAYER_WAGER_KEY: self.wager,
-                   RECORDER_PLAYER_HAND_KEY: [],
-                   RECORDER_PLAYER_ACTION_KEY: {}}
+            # seats sitting the round out are not recorded
+            if self.wager > 0:
+                players = self.recording.game[RECORDER_PLAYERS_KEY]
+                self.record = players[self.name] \
+                    = {RECORDER_PLAYER_WAGER_KEY: self.wager,
+                       RECORDER_PLAYER_HAND_KEY: [],
+                       RECORDER_PLAYER_ACTION_KEY: {}}
+            else:
+                self.record = None
 
     def receive(self, card):
         try:
             return super().receive(card)
         finally:
-            if hasattr(self, 'record'):
+            if self.record is not None:
                 if len(self.record[RECORDER_PLAYER_HAND_KEY]) < 2:
                     self.record[RECORDER_PLAYER_HAND_KEY] \
                         .append(_convert_card(card))
@@ -147,27 +285,36 @@ class PlayerRecorder(Player):
         super().push()
         self.record[RECORDER_PLAYER_RESULT_KEY] = 0
 
-    def clone(self):
-        clone = super().clone(override=self.__class__)
+    def split_slot(self):
+        slot = super().split_slot()
+        slot.recording = self.recording
+        return slot
+
+    def split_into(self, slot):
+        slot.record = None
+        super().split_into(slot)
         player_action = self.record[RECORDER_PLAYER_ACTION_KEY]
         self.record = player_action[RECORDER_PLAYER_ACTION_SPLITS_KEY][0]
         self.record[RECORDER_PLAYER_HAND_KEY].append(
             _convert_card(self.hand[0])
         )
-        clone.record = player_action[RECORDER_PLAYER_ACTION_SPLITS_KEY][1]
-        clone.record[RECORDER_PLAYER_HAND_KEY].extend(
-            _convert_card(c) for c in clone.hand
+        slot.record = player_action[RECORDER_PLAYER_ACTION_SPLITS_KEY][1]
+        slot.record[RECORDER_PLAYER_HAND_KEY].extend(
+            _convert_card(c) for c in slot.hand
         )
-        return clone
 
 
 class DealerRecorder(Dealer):
 
+    def __init__(self, playing_strategy, recording):
+        super().__init__(playing_strategy)
+        self.recording = recording
+
     def receive(self, card):
         try:
             return super().receive(card)
         finally:
-            dealer_record = _simulations[-1][RECORDER_DEALER_KEY]
+            dealer_record = self.recording.game[RECORDER_DEALER_KEY]
             if len(dealer_record[RECORDER_DEALER_HAND_KEY]) < 2:
                 dealer_record[RECORDER_DEALER_HAND_KEY] \
                     .append(_convert_card(card))
@@ -177,7 +324,7 @@ class DealerRecorder(Dealer):
 
 
 def _convert_card(card):
-    if card.rank is Rank.Ace:
+    if card == ACE:
         return 'A'
     else:
-        return card.value
+        return card
@@ -0,0 +1,136 @@
+"""
+Replay of recorded cards. The cards dealt in every game of a recorded
+simulation are put back in the order they left the shoe and fed to a Game,
+so new strategies play the exact card sequence of an old run. The shoe is
+never shuffled; cards are consumed as the new decisions require until the
+sequence runs out. A round cut short by the end of the sequence is undone.
+
+The recording does not mark the reshuffles, so they are found again from the
+shoe and reshuffle rule of the configuration, which must be those of the
+recorded run: the counts of the shoe start over where a recorded round began
+after a reshuffle.
+"""
+
+# system imports
+from array import array
+import collections
+
+# project imports
+from .game import Game
+from .recorder import RECORDER_PLAYERS_KEY, RECORDER_DEALER_KEY, \
+    RECORDER_PLAYER_WAGER_KEY, RECORDER_PLAYER_HAND_KEY, \
+    RECORDER_PLAYER_ACTION_KEY, RECORDER_PLAYER_ACTION_TYPE_KEY, \
+    RECORDER_PLAYER_ACTION_SPLIT, RECORDER_PLAYER_ACTION_SPLITS_KEY, \
+    RECORDER_PLAYER_ACTION_DRAW_KEY, RECORDER_DEALER_HAND_KEY, \
+    RECORDER_DEALER_DRAW_KEY, read_games
+from .shoe import ACE, Card, Shoe
+
+
+class ShoeExhausted(Exception):
+    pass
+
+
+def card_stream(rfile, simulation, config):
+    # the cards of a simulation and the positions in them where a new shoe
+    # began, as Game reshuffles before a round
+    cards = array('b')
+    shuffles = []
+    ncards = config.shoe * Card.nvalues
+    start = 0
+    for game in read_games(rfile, simulation):
+        if (len(cards) - start) / ncards > config.reshuffle:
+            start = len(cards)
+            shuffles.append(start)
+        cards.extend(_game_cards(game))
+    if len(cards) == 0:
+        raise ValueError("simulation %d is not in '%s'" % (simulation, rfile))
+    return cards, shuffles
+
+
+def _game_cards(game):
+    # only the seats with a wager are dealt to
+    players = [p for p in game[RECORDER_PLAYERS_KEY].values()
+               if p[RECORDER_PLAYER_WAGER_KEY] != 0]
+    dealer = game[RECORDER_DEALER_KEY]
+    cards = []
+    for i in range(2):
+        for player in players:
+            cards.append(player[RECORDER_PLAYER_HAND_KEY][i])
+        cards.append(dealer[RECORDER_DEALER_HAND_KEY][i])
+    for player in players:
+        cards.extend(_play_cards(player))
+    cards.extend(dealer[RECORDER_DEALER_DRAW_KEY])
+    return [ACE if c == 'A' else c for c in cards]
+
+
+def _play_cards(record):
+    # both hands of a split get their second card at once, then the hands
+    # are played depth first
+    action = record[RECORDER_PLAYER_ACTION_KEY]
+    if action.get(RECORDER_PLAYER_ACTION_TYPE_KEY) \
+       == RECORDER_PLAYER_ACTION_SPLIT:
+        first, second = action[RECORDER_PLAYER_ACTION_SPLITS_KEY]
+        return [first[RECORDER_PLAYER_HAND_KEY][1],
+                second[RECORDER_PLAYER_HAND_KEY][1]] \
+            + _play_cards(first) + _play_cards(second)
+    return action.get(RECORDER_PLAYER_ACTION_DRAW_KEY, [])
+
+
+class ReplayShoe(Shoe):
+
+    def __init__(self, ndecks, cards, shuffles=()):
+        super().__init__(ndecks)
+        self.cards = cards
+        self.shuffles = collections.deque(shuffles)
+
+    def _shuffled(self):
+        return len(self.shuffles) > 0 and self.shuffles[0] <= self.pointer
+
+    def shuffle(self):
+        # the counts start over where the recorded game reshuffled
+        if self._shuffled():
+            self.shuffles.popleft()
+            if self.counts is not None:
+                self.counts.reset()
+
+    def next(self):
+        try:
+            value = self.cards[self.pointer]
+        except IndexError:
+            raise ShoeExhausted()
+        if self._shuffled():
+            # the new shoe began within a round that drifted from the record
+            self.shuffle()
+        self.pointer += 1
+        return value
+
+    next_hole = next
+
+    def position(self):
+        # a reshuffle is due once the next card is from a new shoe
+        return 1.0 if self._shuffled() else 0.0
+
+
+class ReplayGame(Game):
+
+    def __init__(self, config, stream, index=0):
+        cards, shuffles = stream
+        super().__init__(None, config, 0, index,
+                         ReplayShoe(config.shoe, cards, shuffles))
+
+    def play(self, ngame):
+        count = 0
+        while count < ngame and not self.all_done():
+            saved = [(p, int(p.bankroll), dict(vars(p.stats)))
+                     for p in self.players]
+            try:
+                self._shuffle()
+                self.play_round()
+            except ShoeExhausted:
+                for player, bankroll, stats in saved:
+                    player.bankroll.count = bankroll
+                    vars(player.stats).update(stats)
+                    player.wager = 0
+                    player.close_hand()
+                break
+            count += 1
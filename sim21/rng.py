@@ -0,0 +1,27 @@
+"""
+Random number streams for simulations. Every simulation index gets its own
+generator seeded from a hash of the root seed and the index, so a simulation
+deals the same shoes whether it runs alone, in a pool, or on another node.
+"""
+
+# system imports
+import hashlib
+import random
+
+# constants
+_SEED_BITS = 64
+
+
+def root_seed(seed=None):
+    if seed is None:
+        return random.SystemRandom().getrandbits(_SEED_BITS)
+    return seed
+
+
+def simulation_seed(seed, index):
+    digest = hashlib.sha256(b'%d:%d' % (seed, index)).digest()
+    return int.from_bytes(digest[:_SEED_BITS // 8], 'big')
+
+
+def simulation_rng(seed, index):
+    return random.Random(simulation_seed(seed, index))
@@ -1,14 +1,24 @@
 """
 Simulation of a casino shoe. A shoe contains 2, 4, 6, or 8 decks of cards.
-Reference:
+The shoe is shuffled lazily: every card dealt is drawn at random from the
+cards not dealt yet, one step of a Fisher-Yates shuffle, so the cards left at
+the reshuffle are never shuffled. References:
 
     https://en.wikipedia.org/wiki/Shoe_(cards)
+    https://en.wikipedia.org/wiki/Fisher%E2%80%93Yates_shuffle
 """
 
 # system imports
+from array import array
 from enum import Enum
 import random
 
+# project imports
+from .counts import ShoeCounts
+
+# exported constants
+ACE = 1
+
 
 class Suit(Enum):
     Diamond = 1
@@ -46,28 +56,92 @@ class Card(object):
             self.value = self.rank.value
 
 
+# card objects indexed by blackjack value, for strategies that ask for one;
+# the shoe does not track suits
+_CARDS = (None,) + tuple(Card(None, Rank(v)) for v in range(ACE, 11))
+
+
+def card(value):
+    return _CARDS[value]
+
+
 class Deck:
 
-    def __init__(self):
-        self.cards = [Card(s, r) for s in Suit for r in Rank]
+    values = [Card(s, r).value for s in Suit for r in Rank]
 
 
 class Shoe:
 
-    def __init__(self, ndecks):
+    def __init__(self, ndecks, rng=None):
+        self.rng = random.Random() if rng is None else rng
         self.ncards = ndecks * Card.nvalues
-        self.decks = ndecks * [Deck()]
-        self.order = list(range(self.ncards))
+        self.unshuffled = array('b', ndecks * Deck.values)
+        self.cards = array('b', self.unshuffled)
+        self.pointer = 0
+        self.shuffled = 0   # cards[:shuffled] are in their dealt order
+        self.counts = None
+
+    def observe(self):
+        # dealing only pays for tracking the composition once it is asked for
+        if self.counts is None:
+            self.counts = ShoeCounts(self.ncards // Card.nvalues)
+            self.next = self._next_counted
+            self.next_hole = self._next_hole_counted
+        return self.counts
+
+    def reset(self, rng):
+        self.rng = rng
+        self.cards[:] = self.unshuffled
         self.pointer = 0
+        self.shuffled = 0
+        if self.counts is not None:
+            self.counts.reset()
 
     def shuffle(self):
-        random.shuffle(self.order)
+        # the cards are shuffled as they are dealt
         self.pointer = 0
+        self.shuffled = 0
+        if self.counts is not None:
+            self.counts.reset()
 
     def next(self):
-        index = self.order[self.pointer]
-        self.pointer += 1
-        return self.decks[index // Card.nvalues].cards[index % Card.nvalues]
+        i = self.pointer
+        cards = self.cards
+        value = cards[i]
+        self.pointer = i + 1
+        if i < self.shuffled:
+            # dealt again, as paired games do
+            return value
+        # a random card of those not dealt yet takes its place, drawn as
+        # random.Random draws below a bound
+        n = self.ncards - i
+        k = n.bit_length()
+        getrandbits = self.rng.getrandbits
+        j = getrandbits(k)
+        while j >= n:
+            j = getrandbits(k)
+        j += i
+        cards[i] = cards[j]
+        cards[j] = value
+        self.shuffled = i + 1
+        return cards[i]
+
+    # the dealer's hole card, which is only seen when revealed
+    next_hole = next
+
+    def reveal(self):
+        if self.counts is not None:
+            self.counts.reveal()
+
+    def _next_counted(self):
+        value = type(self).next(self)
+        self.counts.see(value)
+        return value
+
+    def _next_hole_counted(self):
+        value = type(self).next(self)
+        self.counts.hide(value)
+        return value
 
     def position(self):
         return self.pointer / self.ncards
@@ -6,6 +6,7 @@ player statistics
 import re
 import collections
 import json
+import math
 
 # 3rd party imports
 import tabulate
@@ -16,16 +17,41 @@ from .cmdline import SFORMAT_RAW
 # constants
 _CLASS_REGEX = r"^<class '(.+)'>$"
 _RAW_ITEMS = ('games', 'wins', 'loses', 'pushes', 'blackjacks', 'doubles',
-              'splits', 'surrenders', 'outcome')
+              'splits', 'surrenders', 'outcome', 'game_squares',
+              'hand_squares')
 _NORM_ITEMS = ('games', 'hands', 'wins', 'loses', 'pushes', 'blackjacks',
-               'doubles', 'splits', 'surrenders', 'outcome')
+               'doubles', 'splits', 'surrenders', 'outcome', 'outcome se',
+               'outcome ci', 'hand outcome', 'hand outcome se',
+               'hand outcome ci')
+_PAIRED_ITEMS = ('games', 'difference', 'squares')
+_PAIRED_KEY = 'paired'
+_ORACLE_KEY = 'oracles'
 _HAND_NORM_PCT_ITEMS = ('wins', 'loses', 'pushes', 'doubles', 'splits')
 _GAME_NORM_PCT_ITEMS = ('blackjacks', 'surrenders')
+_CONFIDENCE_Z = 1.96    # 95% confidence intervals
+
+
+def _standard_error(total, squares, n):
+    # standard error of the mean from the exact sums of the outcomes and of
+    # their squares
+    if n < 2:
+        return None
+    return math.sqrt((n * squares - total * total) / (n * (n - 1)) / n)
+
+
+def _interval(total, n, se):
+    if se is None:
+        return None
+    mean = total / n
+    return [mean - _CONFIDENCE_Z * se, mean + _CONFIDENCE_Z * se]
 
 
 class _Stats(object):
 
     def __init__(self):
+        self.reset()
+
+    def reset(self):
         self.games = 0
         self.wins = 0
         self.loses = 0
@@ -34,6 +60,8 @@ class _Stats(object):
         self.doubles = 0
         self.splits = 0
         self.surrenders = 0
+        self.game_squares = 0
+        self.hand_squares = 0
 
 
 class PlayerStats(_Stats):
@@ -47,6 +75,18 @@ class PlayerStats(_Stats):
         if type(bankroll) is int:
             self.bankroll = bankroll
 
+    def reset(self):
+        super().reset()
+        self.game_outcome = 0
+
+    def add_hand(self, outcome):
+        self.hand_squares += outcome * outcome
+        self.game_outcome += outcome
+
+    def add_game(self):
+        self.game_squares += self.game_outcome * self.game_outcome
+        self.game_outcome = 0
+
 
 class _StrategyStats(_Stats):
 
@@ -64,31 +104,155 @@ class _StrategyStats(_Stats):
         self.doubles += player_stats.doubles
         self.splits += player_stats.splits
         self.surrenders += player_stats.surrenders
+        self.game_squares += player_stats.game_squares
+        self.hand_squares += player_stats.hand_squares
         self.outcome += int(player.bankroll) - player_stats.bankroll
 
+    def merge(self, other):
+        self.games += other.games
+        self.wins += other.wins
+        self.loses += other.loses
+        self.pushes += other.pushes
+        self.blackjacks += other.blackjacks
+        self.doubles += other.doubles
+        self.splits += other.splits
+        self.surrenders += other.surrenders
+        self.game_squares += other.game_squares
+        self.hand_squares += other.hand_squares
+        self.outcome += other.outcome
+
+    def hands(self):
+        return self.games + self.splits
+
+    def game_error(self):
+        return _standard_error(self.outcome, self.game_squares, self.games)
+
+    def hand_error(self):
+        return _standard_error(self.outcome, self.hand_squares, self.hands())
+
+    def precision(self):
+        se = self.game_error()
+        if se is None:
+            return math.inf
+        return _CONFIDENCE_Z * se
+
+    def summary(self):
+        summary = {k: getattr(self, k) for k in _RAW_ITEMS}
+        game_error = self.game_error()
+        hand_error = self.hand_error()
+        summary['outcome_se'] = game_error
+        summary['outcome_ci'] = _interval(self.outcome, self.games,
+                                          game_error)
+        summary['hand_outcome_se'] = hand_error
+        summary['hand_outcome_ci'] = _interval(self.outcome, self.hands(),
+                                               hand_error)
+        return summary
+
+
+class PairedStats(object):
+
+    def __init__(self):
+        self.games = 0
+        self.difference = 0
+        self.squares = 0
+
+    def add_game(self, difference):
+        self.games += 1
+        self.difference += difference
+        self.squares += difference * difference
+
+    def merge(self, other):
+        self.games += other.games
+        self.difference += other.difference
+        self.squares += other.squares
+
+    def error(self):
+        return _standard_error(self.difference, self.squares, self.games)
+
+    def summary(self):
+        summary = {k: getattr(self, k) for k in _PAIRED_ITEMS}
+        error = self.error()
+        summary['difference_se'] = error
+        summary['difference_ci'] = _interval(self.difference, self.games,
+                                             error)
+        return summary
+
+
+class OracleStats(object):
+
+    def __init__(self, lookups=0, hits=0, size=0):
+        self.lookups = lookups
+        self.hits = hits
+        self.size = size
+
+    def merge(self, other):
+        self.lookups += other.lookups
+        self.hits += other.hits
+        self.size = max(self.size, other.size)
+
+    def hit_rate(self):
+        if self.lookups == 0:
+            return None
+        return self.hits / self.lookups
+
+    def summary(self):
+        return {'lookups': self.lookups, 'hits': self.hits,
+                'hit_rate': self.hit_rate(), 'size': self.size}
+
 
 class SimStats(object):
 
     def __init__(self, sfile, sformat):
         self.stats = collections.defaultdict(_StrategyStats)
+        self.pairs = collections.defaultdict(PairedStats)
+        self.oracles = collections.defaultdict(OracleStats)
         self.sfile = sfile
         self.sformat = sformat
 
     def add_player(self, player):
         self.stats[player.stats.id].accumulate(player)
 
+    def add_pairs(self, pairs):
+        for names, stats in pairs.items():
+            self.pairs[names].merge(stats)
+
+    def add_oracles(self, oracles):
+        for name, stats in oracles.items():
+            if stats.lookups:
+                self.oracles[name].merge(stats)
+
+    def payload(self):
+        return dict(self.stats), dict(self.pairs), dict(self.oracles)
+
+    def merge(self, payload):
+        stats, pairs, oracles = payload
+        for id, strategy_stats in stats.items():
+            self.stats[id].merge(strategy_stats)
+        self.add_pairs(pairs)
+        self.add_oracles(oracles)
+
+    def precision(self):
+        return max((stats.precision() for stats in self.stats.values()),
+                   default=math.inf)
+
     def dump(self):
         if self.sfile is None:
             return
+        summary = {
+            id[0] + ':' + id[1]: stats.summary()
+            for id, stats in self.stats.items()
+        }
+        if self.pairs:
+            summary[_PAIRED_KEY] = {
+                '%s - %s' % names: stats.summary()
+                for names, stats in self.pairs.items()
+            }
+        if self.oracles:
+            summary[_ORACLE_KEY] = {
+                name: stats.summary() for name, stats in self.oracles.items()
+            }
         with open(self.sfile, 'w') as f:
-            json.dump(
-                {
-                    id[0] + ':' + id[1]: {
-                        k: getattr(stats, k) for k in _RAW_ITEMS
-                    }
-                    for id, stats in self.stats.items()
-                }, f
-            )
+            json.dump(summary, f)
 
     def display(self):
         header = ['Stat']
@@ -104,8 +268,7 @@ class SimStats(object):
             for id, stats in self.stats.items():
                 header.append("%s\n%s" % (id[0], id[1]))
                 games = stats.games
-                splits = stats.splits
-                hands = games + splits
+                hands = stats.hands()
                 table[_NORM_ITEMS.index('games')].append(games)
                 table[_NORM_ITEMS.index('hands')].append(hands)
                 for item in _HAND_NORM_PCT_ITEMS:
@@ -119,4 +282,51 @@ class SimStats(object):
                 table[_NORM_ITEMS.index('outcome')].append(
                     '%06.3f' % (stats.outcome / games)
                 )
+                self._error_rows(table, 'outcome', stats.outcome, games,
+                                 stats.game_error())
+                table[_NORM_ITEMS.index('hand outcome')].append(
+                    '%06.3f' % (stats.outcome / hands)
+                )
+                self._error_rows(table, 'hand outcome', stats.outcome, hands,
+                                 stats.hand_error())
         print(tabulate.tabulate(table, headers=header))
+        if self.pairs:
+            print()
+            self._display_pairs()
+        if self.oracles:
+            print()
+            self._display_oracles()
+
+    def _display_pairs(self):
+        table = []
+        for names, stats in self.pairs.items():
+            row = ['%s - %s' % names, stats.games,
+                   '%06.3f' % (stats.difference / stats.games)]
+            error = stats.error()
+            if error is None:
+                row += ['-', '-']
+            else:
+                row += ['%0.3f' % error, '[%0.3f, %0.3f]'
+                        % tuple(_interval(stats.difference, stats.games,
+                                          error))]
+            table.append(row)
+        print(tabulate.tabulate(table, headers=['Paired', 'games',
+                                                'difference', 'se', 'ci']))
+
+    def _display_oracles(self):
+        table = [[name, stats.lookups, stats.hits,
+                  '%0.2f' % (100 * stats.hit_rate()), stats.size]
+                 for name, stats in self.oracles.items()]
+        print(tabulate.tabulate(table, headers=['Oracle', 'lookups', 'hits',
+                                                'hit rate (%)', 'size']))
+
+    @staticmethod
+    def _error_rows(table, item, total, n, se):
+        if se is None:
+            table[_NORM_ITEMS.index(item + ' se')].append('-')
+            table[_NORM_ITEMS.index(item + ' ci')].append('-')
+        else:
+            table[_NORM_ITEMS.index(item + ' se')].append('%0.3f' % se)
+            table[_NORM_ITEMS.index(item + ' ci')].append(
+                '[%0.3f, %0.3f]' % tuple(_interval(total, n, se))
+            )
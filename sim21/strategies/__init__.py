@@ -2,9 +2,13 @@
 Strategies package
 """
 
-from .globals import set_config, set_game
-from .base import BettingStategyBase, PlayingStrategyPlayerBase, strategy_reset
-from .betting import ConstantBettingStrategy
+from .base import BettingStategyBase, PlayingStrategyPlayerBase
+from .betting import ConstantBettingStrategy, CountingBettingStrategy, \
+    HiLoBettingStrategy, KOBettingStrategy, OmegaIIBettingStrategy, \
+    ZenBettingStrategy
 from .dealer import Soft17, Stand17
 from .simple import Simple
 from .basic import Basic
+from .chart import Chart
+from .deviation import Deviations
+from .composition import Composition
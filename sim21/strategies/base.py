@@ -4,40 +4,21 @@ Strategies base classes
 
 
 class StrategyBase(object):
-    c_config = None
-    c_game = None
+    context = None
 
+    def bind(self, context):
+        # called with the GameContext of the game the strategy plays in
+        self.context = context
 
-def strategy_reset():
-    StrategyBase.c_game = None
-
-
-class _StrategyDecorators(object):
-
-    @staticmethod
-    def config(f):
-        def _wrapper(self, *args, **kwargs):
-            if StrategyBase.c_config is None:
-                from .globals import g_config
-                StrategyBase.c_config = g_config
-            return f(self, *args, **kwargs)
-        return _wrapper
-
-    @staticmethod
-    def game(f):
-        def _wrapper(self, *args, **kwargs):
-            if StrategyBase.c_game is None:
-                from .globals import g_game
-                StrategyBase.c_game = g_game
-            return f(self, *args, **kwargs)
-        return _wrapper
+    def reset(self):
+        # called before a game is reused for another simulation
+        pass
 
 
 class BettingStategyBase(StrategyBase):
 
-    @_StrategyDecorators.config
     def get_minimum(self):
-        return self.c_config.minimum
+        return self.context.config.minimum
 
     def get_wager(self, player):
         raise NotImplementedError()
@@ -45,9 +26,8 @@ class BettingStategyBase(StrategyBase):
 
 class PlayingStrategyBase(StrategyBase):
 
-    @_StrategyDecorators.game
     def get_upcard(self):
-        return self.c_game.dealer.get_upcard()
+        return self.context.dealer.get_upcard()
 
     def hit(self, player):
         raise NotImplementedError()
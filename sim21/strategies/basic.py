@@ -4,7 +4,7 @@ Basic player strategy.
 
 # project imports
 from .base import PlayingStrategyPlayerBase
-from ..shoe import Rank
+from ..shoe import ACE
 
 
 class Basic(PlayingStrategyPlayerBase):
@@ -13,20 +13,20 @@ class Basic(PlayingStrategyPlayerBase):
         upcard = self.get_upcard()
         score = player.score()
         if player.is_soft():
-            if upcard.rank is Rank.Ace or upcard.value > 6:
+            if upcard == ACE or upcard > 6:
                 return False
             if score >= 20:
                 return False
             if score == 19:
-                return upcard.value == 6
+                return upcard == 6
             if score == 18:
                 return True
             if score == 17:
-                return upcard.value >= 3
+                return upcard >= 3
             if score >= 15 and score <= 16:
-                return upcard.value >= 4
+                return upcard >= 4
             if score >= 13 and score <= 14:
-                return upcard.value >= 5
+                return upcard >= 5
             else:
                 return False
         else:
@@ -34,37 +34,36 @@ class Basic(PlayingStrategyPlayerBase):
                 return False
             if score == 11:
                 return True
-            if upcard.rank is Rank.Ace:
+            if upcard == ACE:
                 return False
             if score == 10:
-                return upcard.value <= 9
+                return upcard <= 9
             if score == 9:
-                return upcard.value >= 3 and upcard.value <= 6
+                return upcard >= 3 and upcard <= 6
             else:
                 return False
 
     def split(self, player):
         card = player.hand[0]
-        if card.rank is Rank.Ace:
+        if card == ACE:
             return True
-        if card.value == 10:
+        if card == 10:
             return False
         upcard = self.get_upcard()
-        if card.value == 9:
-            return upcard.rank is not Rank.Ace and upcard.value != 10 \
-                   and upcard.value != 7
-        if card.value == 8:
+        if card == 9:
+            return upcard != ACE and upcard != 10 and upcard != 7
+        if card == 8:
             return True
-        if card.value == 7:
-            return upcard.value <= 7 and upcard.rank is not Rank.Ace
-        if card.value == 6:
-            return upcard.value <= 6 and upcard.rank is not Rank.Ace
-        if card.value == 5:
+        if card == 7:
+            return upcard <= 7 and upcard != ACE
+        if card == 6:
+            return upcard <= 6 and upcard != ACE
+        if card == 5:
             return False
-        if card.value == 4:
-            return upcard.value in (5, 6)
+        if card == 4:
+            return upcard in (5, 6)
         else:
-            return upcard.value <= 7
+            return upcard <= 7
 
     def surrender(self, player):
         if player.is_soft():
@@ -72,11 +71,11 @@ class Basic(PlayingStrategyPlayerBase):
         upcard = self.get_upcard()
         score = player.score()
         if score == 17:
-            return upcard.rank is Rank.Ace
+            return upcard == ACE
         if score == 16:
-            return upcard.rank is Rank.Ace or upcard.value in (9, 10)
+            return upcard == ACE or upcard in (9, 10)
         if score == 15:
-            return upcard.rank is Rank.Ace or upcard.value == 10
+            return upcard == ACE or upcard == 10
         return False
 
     def hit(self, player):
@@ -86,17 +85,17 @@ class Basic(PlayingStrategyPlayerBase):
             if score >= 19:
                 return False
             if score == 18:
-                return upcard.value >= 9 or upcard.rank is Rank.Ace
+                return upcard >= 9 or upcard == ACE
             else:
                 return True
         else:
             if score >= 17:
                 return False
             if score >= 13:
-                return upcard.value >= 7 or upcard.rank is Rank.Ace
+                return upcard >= 7 or upcard == ACE
             if score == 12:
-                if upcard.rank is Rank.Ace:
+                if upcard == ACE:
                     return True
-                return upcard.value <= 3 or upcard.value >= 7
+                return upcard <= 3 or upcard >= 7
             else:
                 return True
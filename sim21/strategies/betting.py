@@ -1,14 +1,30 @@
 """
-Betting strategies
+Betting strategies. The counting strategies bet by a ramp keyed on the count
+of a card counting system. A ramp maps counts to wagers in units of the table
+minimum: counts below the lowest or above the highest entry bet that entry
+and counts between entries bet the entry below. It is compiled into a list of
+wagers when the strategy is bound to a game, so a bet is one lookup. Balanced
+systems are keyed on the true count, unbalanced ones (KO) on the running count
+from the initial running count. The running count is kept by the observed
+shoe as cards are dealt.
 """
 
+# system imports
+import math
+
 # package imports
 from .base import BettingStategyBase
+from ..counts import COUNT_HILO, COUNT_KO, COUNT_OMEGA_II, COUNT_ZEN
+
+# constants
+_RAMP_DEFAULT = {1: 1, 2: 2, 3: 4, 4: 6, 5: 8}
+_KO_INITIAL_PER_DECK = 4    # the KO count starts at 4 - 4 * decks
 
 
 class ConstantBettingStrategy(BettingStategyBase):
 
-    def __init__(self):
+    def bind(self, context):
+        super().bind(context)
         self.wager = self.get_minimum()
 
     def get_wager(self, player):
@@ -16,3 +32,80 @@ class ConstantBettingStrategy(BettingStategyBase):
             return self.wager
         else:
             return int(player.bankroll)
+
+
+class CountingBettingStrategy(BettingStategyBase):
+
+    balanced = True
+
+    def __init__(self, system, ramp=None, tags=None):
+        self.system = system
+        self.tags = tags
+        if ramp is None:
+            ramp = _RAMP_DEFAULT
+        ramp = {int(count): units for count, units in ramp.items()}
+        if len(ramp) == 0:
+            raise ValueError("bet ramp must have at least one entry")
+        self.low = min(ramp)
+        self.units = []
+        units = ramp[self.low]
+        for count in range(self.low, max(ramp) + 1):
+            units = ramp.get(count, units)
+            self.units.append(units)
+        self.initial = 0
+
+    def bind(self, context):
+        super().bind(context)
+        self.counts = context.shoe.observe()
+        if self.system not in self.counts.tags:
+            self.counts.add_system(self.system, self.tags)
+        minimum = self.get_minimum()
+        self.wagers = [units * minimum for units in self.units]
+        self.last = len(self.wagers) - 1
+
+    def count(self):
+        if self.balanced:
+            return self.counts.true_count(self.system)
+        return self.counts.running[self.system] + self.initial
+
+    def get_wager(self, player):
+        i = math.floor(self.count()) - self.low
+        if i < 0:
+            i = 0
+        elif i > self.last:
+            i = self.last
+        wager = self.wagers[i]
+        if player.bankroll > wager:
+            return wager
+        else:
+            return int(player.bankroll)
+
+
+class HiLoBettingStrategy(CountingBettingStrategy):
+
+    def __init__(self, ramp=None):
+        super().__init__(COUNT_HILO, ramp)
+
+
+class KOBettingStrategy(CountingBettingStrategy):
+
+    balanced = False
+
+    def __init__(self, ramp=None):
+        super().__init__(COUNT_KO, ramp)
+
+    def bind(self, context):
+        super().bind(context)
+        self.initial = _KO_INITIAL_PER_DECK * (1 - self.counts.ndecks)
+
+
+class OmegaIIBettingStrategy(CountingBettingStrategy):
+
+    def __init__(self, ramp=None):
+        super().__init__(COUNT_OMEGA_II, ramp)
+
+
+class ZenBettingStrategy(CountingBettingStrategy):
+
+    def __init__(self, ramp=None):
+        super().__init__(COUNT_ZEN, ramp)
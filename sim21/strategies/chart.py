@@ -0,0 +1,137 @@
+"""
+Table-driven player strategy. Decisions are loaded from a JSON chart and
+compiled into tables indexed by hand state plus dealer upcard.
+"""
+
+# system imports
+import functools
+import json
+import os
+
+# project imports
+from .base import PlayingStrategyPlayerBase
+from .basic import Basic
+from .simple import Simple
+from ..hand import STATES, SCORE, SOFT, BUSTED, PAIR, NSTATES
+from ..shoe import ACE
+
+# exported constants
+CHART_HARD_KEY = 'hard'
+CHART_SOFT_KEY = 'soft'
+CHART_PAIR_KEY = 'pair'
+CHART_UPCARDS = (2, 3, 4, 5, 6, 7, 8, 9, 10, ACE)
+CHART_BASIC = 'basic'
+CHART_SIMPLE = 'simple'
+TABLE_SIZE = NSTATES * 11   # states plus upcards
+
+# constants
+_CHART_DIR = os.path.join(os.path.dirname(__file__), 'charts')
+_CODES = {     # hit, doubledown, surrender
+    'H': (True, False, False),
+    'S': (False, False, False),
+    'Dh': (True, True, False),
+    'Ds': (False, True, False),
+    'Rh': (True, False, True),
+    'Rs': (False, False, True)
+}
+_PAIR_CODES = {
+    'P': True,
+    '-': False
+}
+
+
+class ChartTables(object):
+
+    def __init__(self, chart):
+        self.hit = [False] * TABLE_SIZE
+        self.doubledown = [False] * TABLE_SIZE
+        self.split = [False] * TABLE_SIZE
+        self.surrender = [False] * TABLE_SIZE
+        hard = _parse_rows(chart.get(CHART_HARD_KEY, {}), _CODES)
+        soft = _parse_rows(chart.get(CHART_SOFT_KEY, {}), _CODES)
+        pair = _parse_rows(chart.get(CHART_PAIR_KEY, {}), _PAIR_CODES)
+        for state in STATES:
+            if BUSTED[state]:
+                continue
+            rows = soft if SOFT[state] else hard
+            row = rows.get(SCORE[state])
+            if row is not None:
+                for upcard, (hit, dd, surrender) in zip(CHART_UPCARDS, row):
+                    self.hit[state + upcard] = hit
+                    self.doubledown[state + upcard] = dd
+                    self.surrender[state + upcard] = surrender
+            row = pair.get(PAIR[state])
+            if row is not None:
+                for upcard, split in zip(CHART_UPCARDS, row):
+                    self.split[state + upcard] = split
+
+
+def _parse_rows(rows, codes):
+    parsed = {}
+    for key, row in rows.items():
+        decisions = []
+        for code in row.split():
+            if code not in codes:
+                raise ValueError("invalid chart code: %s" % code)
+            decisions.append(codes[code])
+        if len(decisions) != len(CHART_UPCARDS):
+            raise ValueError("chart row %s must have %d entries"
+                             % (key, len(CHART_UPCARDS)))
+        for total in _parse_key(key):
+            parsed[total] = decisions
+    return parsed
+
+
+def _parse_key(key):
+    first, _, last = key.partition('-')
+    if last == '':
+        last = first
+    return range(parse_total(first), parse_total(last) + 1)
+
+
+def parse_total(total):
+    if total == 'A':
+        return ACE
+    return int(total)
+
+
+def chart_path(name):
+    if os.path.exists(name):
+        return name
+    return os.path.join(_CHART_DIR, '%s.json' % name)
+
+
+@functools.lru_cache(maxsize=None)
+def load_chart(name):
+    with open(chart_path(name)) as f:
+        return ChartTables(json.load(f))
+
+
+class Chart(PlayingStrategyPlayerBase):
+
+    def __init__(self, name=CHART_BASIC):
+        self.tables = load_chart(name)
+
+    def hit(self, player):
+        return self.tables.hit[player.state + self.get_upcard()]
+
+    def doubledown(self, player):
+        return self.tables.doubledown[player.state + self.get_upcard()]
+
+    def split(self, player):
+        return self.tables.split[player.state + self.get_upcard()]
+
+    def surrender(self, player):
+        return self.tables.surrender[player.state + self.get_upcard()]
+
+
+def strategy_tables(strategy):
+    cls = strategy.__class__
+    if cls is Chart:
+        return strategy.tables
+    if cls is Basic:
+        return load_chart(CHART_BASIC)
+    if cls is Simple:
+        return load_chart(CHART_SIMPLE)
+    raise ValueError("playing strategy is not table driven: %s"
+                     % cls.__name__)
@@ -0,0 +1,56 @@
+"""
+Composition-dependent playing strategy. Every decision compares the expected
+values of the hand given the cards left in the shoe, as the player has seen
+them, which are looked up in an expected value oracle (see sim21.oracle).
+The oracle's cache is bounded by maxsize entries and, given a path, kept
+between runs.
+"""
+
+# package imports
+from .base import PlayingStrategyPlayerBase
+
+# constants
+_RESOLUTION_DEFAULT = 52
+_MAXSIZE_DEFAULT = 1000000
+
+
+class Composition(PlayingStrategyPlayerBase):
+
+    def __init__(self, resolution=_RESOLUTION_DEFAULT,
+                 maxsize=_MAXSIZE_DEFAULT, path=None):
+        self.resolution = resolution
+        self.maxsize = maxsize
+        self.path = path
+
+    def bind(self, context):
+        # imported here as the oracle imports the game module, which imports
+        # the strategies
+        from ..oracle import get_oracle
+        super().bind(context)
+        self.counts = context.shoe.observe()
+        self.oracle = get_oracle(context.config, self.resolution,
+                                 self.maxsize, self.path)
+
+    def _values(self, player):
+        return self.oracle.values(player.hand, self.get_upcard(),
+                                  self.counts)
+
+    def hit(self, player):
+        stand, hit, _, _, _ = self._values(player)
+        return hit > stand
+
+    def doubledown(self, player):
+        stand, hit, double, split, _ = self._values(player)
+        if double is None:
+            return False
+        return double > max(stand, hit) and (split is None or double > split)
+
+    def split(self, player):
+        stand, hit, _, split, _ = self._values(player)
+        return split is not None and split > max(stand, hit)
+
+    def surrender(self, player):
+        values = self._values(player)
+        surrender = values[-1]
+        return surrender is not None \
+            and surrender > max(v for v in values[:-1] if v is not None)
@@ -0,0 +1,141 @@
+"""
+Count-dependent playing strategy. Deviations from a base chart are keyed by
+hand (hard, soft or pair), total and dealer upcard, and apply at or above an
+index of the true count, or below it. Outside that range the chart decides.
+Deviations are loaded from JSON files and compiled into tables indexed by
+hand state plus dealer upcard, like the chart, so a decision is one lookup
+and, only where a deviation exists, one comparison with the true count.
+"""
+
+# system imports
+import functools
+import json
+import os
+
+# package imports
+from .chart import Chart, CHART_BASIC, CHART_HARD_KEY, CHART_SOFT_KEY, \
+    CHART_PAIR_KEY, TABLE_SIZE, parse_total
+from ..counts import COUNT_HILO
+from ..hand import STATES, SCORE, SOFT, BUSTED, PAIR
+
+# exported constants
+DEVIATIONS_KEY = 'deviations'
+DEVIATIONS_ILLUSTRIOUS_18 = 'illustrious18'
+DEVIATIONS_FAB_4 = 'fab4'
+ACTIONS = {    # decision table, decision within the count range
+    'hit': ('hit', True),
+    'stand': ('hit', False),
+    'double': ('doubledown', True),
+    'nodouble': ('doubledown', False),
+    'split': ('split', True),
+    'nosplit': ('split', False),
+    'surrender': ('surrender', True),
+    'nosurrender': ('surrender', False)
+}
+
+# constants
+_DEVIATIONS_DIR = os.path.join(os.path.dirname(__file__), 'deviations')
+
+
+class DeviationTables(object):
+
+    def __init__(self, deviations):
+        # each entry is None, or (index, above, decision) where the decision
+        # applies when (true count >= index) == above
+        self.hit = [None] * TABLE_SIZE
+        self.doubledown = [None] * TABLE_SIZE
+        self.split = [None] * TABLE_SIZE
+        self.surrender = [None] * TABLE_SIZE
+        for deviation in deviations:
+            self._add(deviation)
+
+    def _add(self, deviation):
+        action = deviation.get('action')
+        if action not in ACTIONS:
+            raise ValueError("invalid deviation action: %s" % action)
+        name, decision = ACTIONS[action]
+        if ('above' in deviation) == ('below' in deviation):
+            raise ValueError("deviation needs one of above or below: %s"
+                             % deviation)
+        if 'above' in deviation:
+            entry = (deviation['above'], True, decision)
+        else:
+            entry = (deviation['below'], False, decision)
+        hand = deviation.get('hand')
+        total = parse_total(deviation['total'])
+        upcard = parse_total(deviation['upcard'])
+        table = getattr(self, name)
+        for state in _states(hand, total):
+            table[state + upcard] = entry
+
+
+def _states(hand, total):
+    if hand == CHART_PAIR_KEY:
+        return [s for s in STATES if not BUSTED[s] and PAIR[s] == total]
+    if hand not in (CHART_HARD_KEY, CHART_SOFT_KEY):
+        raise ValueError("invalid deviation hand: %s" % hand)
+    soft = hand == CHART_SOFT_KEY
+    return [s for s in STATES
+            if not BUSTED[s] and SOFT[s] == soft and SCORE[s] == total]
+
+
+def deviations_path(name):
+    if os.path.exists(name):
+        return name
+    return os.path.join(_DEVIATIONS_DIR, '%s.json' % name)
+
+
+def read_deviations(names):
+    deviations = []
+    for name in names:
+        with open(deviations_path(name)) as f:
+            deviations.extend(json.load(f)[DEVIATIONS_KEY])
+    return deviations
+
+
+@functools.lru_cache(maxsize=None)
+def load_deviations(names):
+    # later files override the deviations of earlier ones
+    return DeviationTables(read_deviations(names))
+
+
+class Deviations(Chart):
+
+    def __init__(self, chart=CHART_BASIC,
+                 deviations=(DEVIATIONS_ILLUSTRIOUS_18, DEVIATIONS_FAB_4),
+                 system=COUNT_HILO, tags=None):
+        super().__init__(chart)
+        if isinstance(deviations, str):
+            deviations = (deviations,)
+        self.deviations = load_deviations(tuple(deviations))
+        self.system = system
+        self.tags = tags
+
+    def bind(self, context):
+        super().bind(context)
+        self.counts = context.shoe.observe()
+        if self.system not in self.counts.tags:
+            self.counts.add_system(self.system, self.tags)
+
+    def _decide(self, deviations, chart, player):
+        i = player.state + self.get_upcard()
+        deviation = deviations[i]
+        if deviation is not None:
+            index, above, decision = deviation
+            if (self.counts.true_count(self.system) >= index) == above:
+                return decision
+        return chart[i]
+
+    def hit(self, player):
+        return self._decide(self.deviations.hit, self.tables.hit, player)
+
+    def doubledown(self, player):
+        return self._decide(self.deviations.doubledown,
+                            self.tables.doubledown, player)
+
+    def split(self, player):
+        return self._decide(self.deviations.split, self.tables.split, player)
+
+    def surrender(self, player):
+        return self._decide(self.deviations.surrender,
+                            self.tables.surrender, player)
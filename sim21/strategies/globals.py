@@ -1,17 +0,0 @@
-"""
-Strategies game module
-"""
-
-# global variables
-g_config = None
-g_game = None
-
-
-def set_config(config):
-    global g_config
-    g_config = config
-
-
-def set_game(game):
-    global g_game
-    g_game = game
@@ -0,0 +1,99 @@
+"""
+Per-phase timing of games. The phases of a round, the shoe shuffle, the
+cleanup of split hands and the strategy decisions of an instrumented game
+are replaced on the instance by wrappers that accumulate time and call
+counts, so games that are not instrumented run unchanged. Strategy times
+are also part of the phase that made the call.
+"""
+
+# system imports
+import collections
+import time
+
+# 3rd party imports
+import tabulate
+
+# constants
+_PHASES = ('_place_bets', '_deal', '_surrender', '_player_hands',
+           '_dealer_hand', '_show_hands')
+_DECISIONS = ('hit', 'doubledown', 'split', 'surrender')
+_TOP_LEVEL = ('shuffle', 'place_bets', 'deal', 'surrender', 'player_hands',
+              'dealer_hand', 'show_hands', 'cleanup')
+
+
+class PhaseTimers(object):
+
+    def __init__(self):
+        self.times = collections.defaultdict(float)
+        self.counts = collections.defaultdict(int)
+        self.elapsed = 0.0
+        self.hands = 0
+        self._wrapped = set()
+
+    def instrument(self, game):
+        for name in _PHASES:
+            self._wrap(game, name, name[1:])
+        self._wrap(game.shoe, 'shuffle', 'shuffle')
+        self._wrap(game.players, 'cleanup', 'cleanup')
+        self._wrap(game.dealer.playing_strategy, 'hit', 'dealer.hit')
+        for player in game.players:
+            self._wrap(player.betting_strategy, 'get_wager',
+                       'strategy.get_wager')
+            for name in _DECISIONS:
+                self._wrap(player.playing_strategy, name,
+                           'strategy.%s' % name)
+
+    def _wrap(self, obj, name, label):
+        key = (id(obj), name)
+        if key in self._wrapped:
+            return
+        self._wrapped.add(key)
+        method = getattr(obj, name)
+        times = self.times
+        counts = self.counts
+        clock = time.perf_counter
+
+        def timed(*args):
+            start = clock()
+            try:
+                return method(*args)
+            finally:
+                times[label] += clock() - start
+                counts[label] += 1
+        setattr(obj, name, timed)
+
+    def play(self, game, ngame):
+        start = time.perf_counter()
+        game.play(ngame)
+        self.elapsed += time.perf_counter() - start
+        for player in game.players:
+            stats = player.stats
+            self.hands += stats.wins + stats.loses + stats.pushes
+
+    def display(self):
+        elapsed = self.elapsed
+        labels = [label for label in _TOP_LEVEL if label in self.counts]
+        labels += sorted(label for label in self.counts
+                         if label not in _TOP_LEVEL)
+        table = [self._row(label) for label in labels]
+        other = elapsed - sum(self.times[label] for label in _TOP_LEVEL)
+        table.append(['other', '', '%0.3f' % other, '',
+                      _percent(other, elapsed)])
+        print(tabulate.tabulate(table, headers=['Phase', 'Calls', 'Time (s)',
+                                                'Per call (us)', 'Share (%)']))
+        print("elapsed: %0.3f s" % elapsed)
+        if elapsed > 0:
+            print("hands/sec: %0.0f" % (self.hands / elapsed))
+
+    def _row(self, label):
+        seconds = self.times[label]
+        count = self.counts[label]
+        return [label, count, '%0.3f' % seconds,
+                '%0.2f' % (1e6 * seconds / count),
+                _percent(seconds, self.elapsed)]
+
+
+def _percent(seconds, elapsed):
+    if elapsed == 0:
+        return ''
+    return '%0.1f' % (100 * seconds / elapsed)
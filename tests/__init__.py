@@ -10,3 +10,20 @@ from .doubledown import DoubleDownTests
 from .split import SplitTests
 from .surrender import SurrenderTests
 from .stats import StatsTests
+from .parallel import ParallelTests
+from .seed import SeedTests
+from .shoe import ShoeTests
+from .hand import HandTests
+from .chart import ChartTests
+from .batch import BatchTests
+from .edge import EdgeTests
+from .paired import PairedTests
+from .history import HistoryTests
+from .replay import ReplayTests
+from .bench import BenchTests
+from .timing import TimingTests
+from .counting import CountingTests
+from .deviation import DeviationTests
+from .indices import IndexTests
+from .chartgen import ChartGeneratorTests
+from .composition import CompositionTests
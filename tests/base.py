@@ -3,10 +3,8 @@ Unit test base class.
 """
 
 # system imports
-import random
 import unittest
 import os
-import json
 import re
 
 # test imports
@@ -14,30 +12,44 @@ from .sequencer import sequencer, set_sequences
 
 # project imports
 from sim21 import main
+from sim21.recorder import RECORDER_INDEX_SUFFIX, read_games
+from sim21.shoe import Shoe
+
+# constants
+_SHOE_SHUFFLE = Shoe.shuffle
+
+
+def _sequencer(shoe):
+    _SHOE_SHUFFLE(shoe)
+    sequencer(shoe.cards)
+    # the sequenced cards are dealt in their order
+    shoe.shuffled = shoe.ncards
 
 
 class TestBase(unittest.TestCase):
 
-    rfile_base = 'records'
-    rfile = 'records-0.json'
+    rfile = 'records.ndjson'
 
     @classmethod
     def setUpClass(cls):
-        cls._shuffle = random.shuffle
-        random.shuffle = sequencer
+        Shoe.shuffle = _sequencer
         cls.config_dir = os.path.join(os.path.dirname(__file__), 'configs')
 
     @classmethod
     def tearDownClass(cls):
-        random.shuffle = cls._shuffle
+        Shoe.shuffle = _SHOE_SHUFFLE
 
     def run_sim21(self, sequences, config):
         set_sequences(sequences)
-        result = main(['sim21', '-q', '-r', self.rfile_base, '-n',
+        result = main(['sim21', '-q', '-r', self.rfile, '-n',
                        str(len(sequences)), '1', config])
         self.assertEqual(0, result)
-        with open(self.rfile) as f:
-            return json.load(f)
+        return list(read_games(self.rfile, 0))
+
+    def remove_records(self):
+        for path in (self.rfile, self.rfile + RECORDER_INDEX_SUFFIX):
+            if os.path.exists(path):
+                os.remove(path)
 
 
 def test_decorator(f):
@@ -53,8 +65,10 @@ def test_decorator(f):
                                     re.sub(r'[(,]', '.',
                                            re.sub(r'[\s)\']', '',
                                                   test_case.id())))
-                os.rename(self.rfile, "%s.json" % test_label)
+                os.rename(self.rfile, "%s.ndjson" % test_label)
+                os.rename(self.rfile + RECORDER_INDEX_SUFFIX,
+                          "%s.ndjson%s" % (test_label, RECORDER_INDEX_SUFFIX))
             raise
         else:
-            os.remove(self.rfile)
+            self.remove_records()
     return _wrapper
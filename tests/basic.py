@@ -30,8 +30,7 @@ class _BasicStrategyTestBase(TestBase):
         cls.config = os.path.join(cls.config_dir, 'single_player.json')
 
     def tearDown(self):
-        if os.path.exists(self.rfile):
-            os.remove(self.rfile)
+        self.remove_records()
 
     @staticmethod
     def normalize_actions(actions):
@@ -0,0 +1,86 @@
+"""
+batch engine tests
+"""
+
+# system imports
+import math
+import unittest
+import os
+import json
+
+# project imports
+from sim21 import main
+
+
+class BatchTests(unittest.TestCase):
+
+    config_dir = os.path.join(os.path.dirname(__file__), 'configs')
+    stats_file = 'stats.json'
+    seed = 21
+    rates = ('wins', 'loses', 'pushes', 'blackjacks', 'doubles', 'splits',
+             'surrenders')
+
+    def tearDown(self):
+        if os.path.exists(self.stats_file):
+            os.remove(self.stats_file)
+
+    def _run(self, cfile, *options):
+        result = main(['sim21', '-q', '-s', 'raw', '--seed', str(self.seed),
+                       '-n', '200'] + list(options)
+                      + ['20', os.path.join(self.config_dir, cfile),
+                         self.stats_file])
+        self.assertEqual(0, result)
+        with open(self.stats_file) as f:
+            return json.load(f)
+
+    def _test_config(self, cfile):
+        # the engines deal different cards, so they agree up to the
+        # sampling error
+        scalar = self._run(cfile)
+        batch = self._run(cfile, '-b', '10')
+        self.assertEqual(scalar.keys(), batch.keys())
+        for key, stats in scalar.items():
+            other = batch[key]
+            self._assert_close(stats['outcome'] / stats['games'],
+                               other['outcome'] / other['games'],
+                               math.hypot(stats['outcome_se'],
+                                          other['outcome_se']))
+            for rate in self.rates:
+                p = stats[rate] / stats['games']
+                q = other[rate] / other['games']
+                self._assert_close(p, q, math.sqrt(
+                    p * (1 - p) / stats['games']
+                    + q * (1 - q) / other['games']))
+
+    def _assert_close(self, a, b, se):
+        self.assertLessEqual(abs(a - b), 4 * se)
+
+    def test_single_player(self):
+        self._test_config('single_player.json')
+
+    def test_multi_player(self):
+        self._test_config('multi_player.json')
+
+    def test_no_das(self):
+        self._test_config('no_das.json')
+
+    def test_split_maxhand_4(self):
+        self._test_config('split_maxhand_4.json')
+
+    def test_surrender_early(self):
+        self._test_config('surrender_early.json')
+
+    def test_blackjack_65(self):
+        self._test_config('blackjack_65.json')
+
+    def test_csm(self):
+        self._test_config('csm.json')
+
+    def test_jobs(self):
+        self.assertEqual(self._run('multi_player.json', '-b', '5'),
+                         self._run('multi_player.json', '-b', '5', '-j', '2'))
+
+    def test_batch_size(self):
+        # a simulation deals the same cards whatever batch it is played in
+        self.assertEqual(self._run('multi_player.json', '-b', '10'),
+                         self._run('multi_player.json', '-b', '3'))
@@ -0,0 +1,40 @@
+"""
+benchmark tests
+"""
+
+# system imports
+import contextlib
+import io
+import json
+import os
+import unittest
+
+# project imports
+from sim21.bench import main, compare, BENCH_METRICS_KEY
+
+
+class BenchTests(unittest.TestCase):
+
+    config_dir = os.path.join(os.path.dirname(__file__), 'configs')
+    bfile = 'bench.json'
+
+    def tearDown(self):
+        if os.path.exists(self.bfile):
+            os.remove(self.bfile)
+
+    def test_baseline(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = main(['sim21-bench', '-n', '1', '-o', self.bfile,
+                           os.path.join(self.config_dir, 'das.json')])
+        self.assertEqual(0, result)
+        with open(self.bfile) as f:
+            metrics = json.load(f)[BENCH_METRICS_KEY]
+        self.assertIn('game.play', metrics)
+        self.assertTrue(all(rate > 0 for rate in metrics.values()))
+
+    def test_compare(self):
+        baseline = {'a': 100.0, 'b': 100.0, 'c': 100.0}
+        metrics = {'a': 95.0, 'b': 80.0, 'c': 150.0, 'd': 10.0}
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(['b'], compare(baseline, metrics, 0.1))
+            self.assertEqual([], compare(baseline, metrics, 0.25))
@@ -0,0 +1,54 @@
+"""
+Test chart playing strategy against the strategies it reproduces.
+"""
+
+# system imports
+import itertools
+import unittest
+
+# project imports
+from sim21.player import BasePlayer
+from sim21.shoe import ACE
+from sim21.strategies import Basic, Simple, Chart
+from sim21.strategies.chart import CHART_UPCARDS, CHART_SIMPLE
+
+
+class ChartTests(unittest.TestCase):
+
+    values = range(ACE, 11)
+
+    def _compare(self, strategy, chart, ncards, decisions):
+        for cards in itertools.product(self.values, repeat=ncards):
+            player = BasePlayer()
+            for card in cards:
+                player.receive(card)
+            if player.busted():
+                continue
+            for upcard in CHART_UPCARDS:
+                strategy.get_upcard = chart.get_upcard = lambda: upcard
+                for decision in decisions:
+                    with self.subTest(cards=cards, upcard=upcard,
+                                      decision=decision):
+                        self.assertEqual(
+                            getattr(strategy, decision)(player),
+                            getattr(chart, decision)(player)
+                        )
+
+    def test_basic(self):
+        self._compare(Basic(), Chart(), 2,
+                      ('hit', 'doubledown', 'surrender'))
+        self._compare(Basic(), Chart(), 3, ('hit',))
+        for value, upcard in itertools.product(self.values, CHART_UPCARDS):
+            player = BasePlayer()
+            player.receive(value)
+            player.receive(value)
+            basic = Basic()
+            chart = Chart()
+            basic.get_upcard = chart.get_upcard = lambda: upcard
+            with self.subTest(pair=value, upcard=upcard):
+                self.assertEqual(basic.split(player), chart.split(player))
+
+    def test_simple(self):
+        self._compare(Simple(), Chart(CHART_SIMPLE), 2,
+                      ('hit', 'doubledown', 'split', 'surrender'))
+        self._compare(Simple(), Chart(CHART_SIMPLE), 3, ('hit',))
@@ -0,0 +1,64 @@
+"""
+basic strategy chart generator tests
+"""
+
+# system imports
+import unittest
+import os
+import json
+import shutil
+import tempfile
+
+# project imports
+from sim21.chartgen import generate_chart, rules_hash
+from sim21.config import Config
+from sim21.edge import HouseEdge
+from sim21.strategies.chart import ChartTables, load_chart, CHART_BASIC
+
+
+class ChartGeneratorTests(unittest.TestCase):
+
+    config_dir = os.path.join(os.path.dirname(__file__), 'configs')
+
+    def setUp(self):
+        self.cache = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache)
+
+    def _config(self, cfile):
+        return Config(os.path.join(self.config_dir, cfile))
+
+    def test_edge(self):
+        # the generated chart plays at least as well as the shipped one
+        config = self._config('single_player.json')
+        chart = generate_chart(config, self.cache)
+        self.assertEqual('S  S  S  S  S  H  H  Rh Rh Rh', chart['hard']['16'])
+        # Game surrenders a pair of eights before it would split them
+        self.assertEqual('P  P  P  P  P  P  P  -  -  -', chart['pair']['8'])
+        edge = HouseEdge(config)
+        self.assertGreaterEqual(
+            edge.expected_value(ChartTables(chart)),
+            edge.expected_value(load_chart(CHART_BASIC)))
+
+    def test_rules(self):
+        chart = generate_chart(self._config('surrender_none.json'),
+                               self.cache)
+        for row in chart['hard'].values():
+            self.assertNotIn('R', row)
+        self.assertNotEqual(rules_hash(self._config('no_das.json')),
+                            rules_hash(self._config('single_player.json')))
+        self.assertEqual(rules_hash(self._config('blackjack_65.json')),
+                         rules_hash(self._config('single_player.json')))
+
+    def test_cache(self):
+        config = self._config('single_player.json')
+        chart = generate_chart(config, self.cache)
+        self.assertEqual(['%s.json' % rules_hash(config)],
+                         os.listdir(self.cache))
+        self.assertEqual(chart, generate_chart(config, self.cache))
+        # a cached chart is read back rather than generated
+        with open(os.path.join(self.cache, '%s.json' % rules_hash(config)),
+                  'w') as f:
+            json.dump({'hard': {}}, f)
+        self.assertEqual({'hard': {}}, generate_chart(config, self.cache))
@@ -0,0 +1,103 @@
+"""
+composition-dependent playing strategy tests
+"""
+
+# system imports
+import unittest
+import os
+import json
+import shutil
+import tempfile
+
+# project imports
+from sim21 import main
+from sim21.config import Config
+from sim21.counts import ShoeCounts
+from sim21.oracle import EVOracle, ORACLE_STAND, ORACLE_HIT, ORACLE_DOUBLE, \
+    ORACLE_SPLIT, ORACLE_SURRENDER
+from sim21.shoe import ACE
+
+
+class CompositionTests(unittest.TestCase):
+
+    config_dir = os.path.join(os.path.dirname(__file__), 'configs')
+    stats_file = 'stats.json'
+
+    def setUp(self):
+        self.config = Config(os.path.join(self.config_dir,
+                                          'composition.json'))
+        self.cache = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache)
+        if os.path.exists(self.stats_file):
+            os.remove(self.stats_file)
+
+    def _values(self, oracle, hand, upcard, seen=()):
+        counts = ShoeCounts(self.config.shoe)
+        for card in tuple(hand) + (upcard,) + tuple(seen):
+            counts.see(card)
+        return oracle.values(hand, upcard, counts)
+
+    def test_decisions(self):
+        oracle = EVOracle(self.config, 13, 100)
+        values = self._values(oracle, (6, 5), 6)
+        self.assertEqual(ORACLE_DOUBLE, values.index(max(values[:3])))
+        self.assertIsNone(values[ORACLE_SPLIT])
+        values = self._values(oracle, (8, 8), 6)
+        self.assertEqual(ORACLE_SPLIT, values.index(max(values)))
+        values = self._values(oracle, (10, 6), 10)
+        self.assertGreater(values[ORACLE_SURRENDER],
+                           max(values[ORACLE_STAND], values[ORACLE_HIT]))
+        values = self._values(oracle, (10, 7, 2), ACE)
+        self.assertGreater(values[ORACLE_STAND], values[ORACLE_HIT])
+        self.assertIsNone(values[ORACLE_DOUBLE])
+        # twelve against a four hits once the tens are gone
+        values = self._values(oracle, (10, 2), 4)
+        self.assertGreater(values[ORACLE_STAND], values[ORACLE_HIT])
+        values = self._values(oracle, (10, 2), 4, [10] * 16)
+        self.assertGreater(values[ORACLE_HIT], values[ORACLE_STAND])
+
+    def test_cache(self):
+        path = os.path.join(self.cache, 'oracle.pickle')
+        oracle = EVOracle(self.config, 13, 2, path)
+        for hand in ((10, 6), (10, 5), (10, 6), (10, 4)):
+            self._values(oracle, hand, 10)
+        stats = oracle.collect()
+        self.assertEqual((4, 1, 2), (stats.lookups, stats.hits, stats.size))
+        oracle.save()
+        # (10, 5) was the least recently used and evicted
+        oracle = EVOracle(self.config, 13, 2, path)
+        self._values(oracle, (10, 4), 10)
+        self._values(oracle, (10, 5), 10)
+        stats = oracle.collect()
+        self.assertEqual((2, 1, 2), (stats.lookups, stats.hits, stats.size))
+        with self.assertRaises(ValueError):
+            EVOracle(self.config, 10, 2)
+
+    def test_merge(self):
+        # processes saving to one file keep each other's values
+        path = os.path.join(self.cache, 'oracle.pickle')
+        first = EVOracle(self.config, 13, 10, path)
+        second = EVOracle(self.config, 13, 10, path)
+        self._values(first, (10, 6), 10)
+        self._values(second, (10, 5), 10)
+        first.save()
+        second.save()
+        oracle = EVOracle(self.config, 13, 10, path)
+        self._values(oracle, (10, 6), 10)
+        self._values(oracle, (10, 5), 10)
+        self.assertEqual(2, oracle.collect().hits)
+
+    def test_simulation(self):
+        result = main(['sim21', '-q', '--seed', '21', '-n', '50', '1',
+                       os.path.join(self.config_dir, 'composition.json'),
+                       self.stats_file])
+        self.assertEqual(0, result)
+        with open(self.stats_file) as f:
+            stats = json.load(f)
+        oracles = stats.pop('oracles')
+        self.assertEqual(2, len(stats))
+        for summary in oracles.values():
+            self.assertGreater(summary['lookups'], 0)
+            self.assertLessEqual(summary['size'], 10000)
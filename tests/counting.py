@@ -0,0 +1,78 @@
+"""
+counting betting strategy tests
+"""
+
+# system imports
+import unittest
+import os
+import json
+
+# project imports
+from sim21 import main
+from sim21.config import Config
+from sim21.counts import COUNT_HILO, COUNT_KO
+from sim21.game import Game
+
+
+class CountingTests(unittest.TestCase):
+
+    config_dir = os.path.join(os.path.dirname(__file__), 'configs')
+    stats_file = 'stats.json'
+
+    def tearDown(self):
+        if os.path.exists(self.stats_file):
+            os.remove(self.stats_file)
+
+    def _players(self):
+        config = Config(os.path.join(self.config_dir, 'counting.json'))
+        game = Game(None, config, 21)
+        return config.minimum, game.shoe.counts, \
+            {p.name: p for p in game.players}
+
+    def test_ramp(self):
+        minimum, counts, players = self._players()
+        player = players['hilo']
+        strategy = player.betting_strategy
+        counts.unseen = 52
+        for running, units in ((-3, 1), (0, 1), (1, 1), (2, 2), (3, 4),
+                               (4, 8), (9, 8)):
+            counts.running[COUNT_HILO] = running
+            self.assertEqual(units * minimum, strategy.get_wager(player))
+        counts.unseen = 104
+        counts.running[COUNT_HILO] = 5
+        self.assertEqual(2 * minimum, strategy.get_wager(player))
+
+    def test_unbalanced(self):
+        minimum, counts, players = self._players()
+        player = players['ko']
+        strategy = player.betting_strategy
+        self.assertEqual(4 - 4 * counts.ndecks, strategy.count())
+        counts.running[COUNT_KO] = 4 * counts.ndecks - 4 + 3
+        self.assertEqual(4 * minimum, strategy.get_wager(player))
+
+    def test_simulation(self):
+        result = main(['sim21', '-q', '--seed', '21', '-n', '500', '2',
+                       os.path.join(self.config_dir, 'counting.json'),
+                       self.stats_file])
+        self.assertEqual(0, result)
+        with open(self.stats_file) as f:
+            stats = json.load(f)
+        self.assertEqual(6, len(stats))
+        for summary in stats.values():
+            self.assertEqual(1000, summary['games'])
+
+    def test_sit_out(self):
+        # rounds bet at 0 units are sat out and are not games
+        result = main(['sim21', '-q', '--seed', '21', '-n', '300', '1',
+                       os.path.join(self.config_dir, 'wonging.json'),
+                       self.stats_file])
+        self.assertEqual(0, result)
+        with open(self.stats_file) as f:
+            stats = json.load(f)
+        games = sorted(s['games'] for s in stats.values())
+        self.assertLess(games[0], games[1])
+        self.assertEqual(300, games[1])
+        for summary in stats.values():
+            self.assertEqual(summary['games'] + summary['splits'],
+                             summary['wins'] + summary['loses']
+                             + summary['pushes'])
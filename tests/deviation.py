@@ -0,0 +1,78 @@
+"""
+deviation playing strategy tests
+"""
+
+# system imports
+import unittest
+import os
+
+# project imports
+from sim21.config import Config
+from sim21.counts import COUNT_HILO
+from sim21.game import Game
+from sim21.player import BasePlayer
+from sim21.shoe import ACE
+from sim21.strategies.chart import load_chart, CHART_BASIC
+from sim21.strategies.deviation import DeviationTables
+
+
+class DeviationTests(unittest.TestCase):
+
+    config_dir = os.path.join(os.path.dirname(__file__), 'configs')
+
+    def setUp(self):
+        config = Config(os.path.join(self.config_dir, 'counting.json'))
+        game = Game(None, config, 21)
+        self.counts = game.shoe.counts
+        self.counts.unseen = 52
+        self.strategy = {p.name: p for p in game.players}[
+            'hilo-deviations'].playing_strategy
+
+    def _decide(self, decision, cards, upcard, true_count):
+        player = BasePlayer()
+        for card in cards:
+            player.receive(card)
+        self.counts.running[COUNT_HILO] = true_count
+        self.strategy.get_upcard = lambda: upcard
+        return getattr(self.strategy, decision)(player)
+
+    def test_index(self):
+        for decision, cards, upcard, below, above in (
+                ('hit', (10, 6), 10, True, False),          # stand at 0
+                ('hit', (10, 2), 4, True, False),           # hit below 0
+                ('doubledown', (6, 4), 10, False, True),    # double at 4
+                ('split', (10, 10), 6, False, True),        # split at 4
+                ('surrender', (10, 4), 10, False, True)):   # surrender at 3
+            index = {'hit': 0, 'doubledown': 4, 'split': 4,
+                     'surrender': 3}[decision]
+            with self.subTest(decision=decision, cards=cards):
+                self.assertEqual(below, self._decide(decision, cards, upcard,
+                                                     index - 1))
+                self.assertEqual(above, self._decide(decision, cards, upcard,
+                                                     index))
+
+    def test_chart(self):
+        # without a deviation the chart decides whatever the count
+        chart = load_chart(CHART_BASIC)
+        player = BasePlayer()
+        for card in (10, 7):
+            player.receive(card)
+        for true_count in (-10, 0, 10):
+            for upcard in (2, 7, 10, ACE):
+                self.assertEqual(chart.hit[player.state + upcard],
+                                 self._decide('hit', (10, 7), upcard,
+                                              true_count))
+
+    def test_invalid(self):
+        for deviation in (
+                {'hand': 'hard', 'total': 16, 'upcard': 10,
+                 'action': 'fold', 'above': 0},
+                {'hand': 'hard', 'total': 16, 'upcard': 10,
+                 'action': 'stand'},
+                {'hand': 'hard', 'total': 16, 'upcard': 10,
+                 'action': 'stand', 'above': 0, 'below': 0},
+                {'hand': 'pairs', 'total': 8, 'upcard': 10,
+                 'action': 'split', 'above': 0}):
+            with self.subTest(deviation=deviation):
+                with self.assertRaises(ValueError):
+                    DeviationTables([deviation])
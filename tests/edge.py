@@ -0,0 +1,29 @@
+"""
+house edge tests
+"""
+
+# system imports
+import unittest
+import os
+
+# project imports
+from sim21.config import Config
+from sim21.edge import HouseEdge
+from sim21.strategies.chart import load_chart, CHART_BASIC
+
+
+class EdgeTests(unittest.TestCase):
+
+    config_dir = os.path.join(os.path.dirname(__file__), 'configs')
+
+    def _edge(self, cfile):
+        edge = HouseEdge(Config(os.path.join(self.config_dir, cfile)))
+        return -edge.expected_value(load_chart(CHART_BASIC))
+
+    def test_basic(self):
+        self.assertAlmostEqual(0.0095, self._edge('blackjack_32.json'),
+                               places=4)
+
+    def test_blackjack_payout(self):
+        self.assertGreater(self._edge('blackjack_65.json'),
+                           self._edge('blackjack_32.json') + 0.005)
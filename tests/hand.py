@@ -0,0 +1,37 @@
+"""
+hand state machine tests
+"""
+
+# system imports
+import itertools
+import unittest
+
+# project imports
+from sim21.hand import SCORE, SOFT, BUSTED, BLACKJACK, PAIR, hand_state
+from sim21.shoe import ACE
+
+
+class HandTests(unittest.TestCase):
+
+    values = range(ACE, 11)
+
+    def test_hands(self):
+        for ncards in range(1, 5):
+            for cards in itertools.product(self.values, repeat=ncards):
+                with self.subTest(cards=cards):
+                    self._test_hand(cards)
+
+    def _test_hand(self, cards):
+        state = hand_state(cards)
+        hard = sum(cards)
+        soft = ACE in cards and hard + 10 <= 21
+        if hard <= 21:
+            self.assertEqual(hard + 10 if soft else hard, SCORE[state])
+        self.assertEqual(soft, SOFT[state])
+        self.assertEqual(hard > 21, BUSTED[state])
+        self.assertEqual(len(cards) == 2 and soft and hard == 11,
+                         BLACKJACK[state])
+        if len(cards) == 2 and cards[0] == cards[1]:
+            self.assertEqual(cards[0], PAIR[state])
+        else:
+            self.assertEqual(0, PAIR[state])
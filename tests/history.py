@@ -0,0 +1,74 @@
+"""
+binary hand history tests
+"""
+
+# system imports
+import unittest
+import os
+import json
+
+# project imports
+from sim21 import main
+from sim21.history import HISTORY_DEALER_SEAT, read_hands, hand_cards
+from sim21.recorder import RECORDER_INDEX_SUFFIX, RECORDER_PLAYERS_KEY, \
+    RECORDER_PLAYER_HAND_KEY, RECORDER_PLAYER_BANKROLL_KEY, \
+    RECORDER_DEALER_KEY, RECORDER_DEALER_HAND_KEY, read_games
+
+
+class HistoryTests(unittest.TestCase):
+
+    config_dir = os.path.join(os.path.dirname(__file__), 'configs')
+    stats_file = 'stats.json'
+    hands_file = 'records.hands'
+    rfile = 'records.ndjson'
+
+    def tearDown(self):
+        for path in (self.stats_file, self.hands_file, self.rfile,
+                     self.rfile + RECORDER_INDEX_SUFFIX):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _run(self, rfile, *options, config='multi_player.json'):
+        result = main(['sim21', '-q', '--seed', '21', '-n', '100', '-r',
+                       rfile] + list(options)
+                      + ['3', os.path.join(self.config_dir, config),
+                         self.stats_file])
+        self.assertEqual(0, result)
+
+    def test_totals(self, config='multi_player.json'):
+        self._run(self.hands_file, '-j', '2', config=config)
+        with open(self.stats_file) as f:
+            stats = json.load(f).values()
+        hands = read_hands(self.hands_file)
+        players = hands[hands['seat'] != HISTORY_DEALER_SEAT]
+        self.assertEqual(sum(s['outcome'] for s in stats),
+                         players['result'].sum())
+        self.assertEqual(sum(s['games'] + s['splits'] for s in stats),
+                         len(players))
+        dealer = hands[hands['seat'] == HISTORY_DEALER_SEAT]
+        self.assertEqual(300, len(dealer))
+
+    def test_sit_out(self):
+        # seats betting 0 units have no hands in the rounds they sit out
+        self.test_totals('wonging.json')
+
+    def test_records(self):
+        self._run(self.hands_file)
+        self._run(self.rfile)
+        hands = read_hands(self.hands_file)
+        game = hands[(hands['simulation'] == 1) & (hands['game'] == 0)]
+        record = next(read_games(self.rfile, 1))
+        cards = hand_cards(game)
+        self.assertEqual(HISTORY_DEALER_SEAT, game['seat'][-1])
+        self.assertEqual([1 if c == 'A' else c for c in
+                          record[RECORDER_DEALER_KEY]
+                                [RECORDER_DEALER_HAND_KEY]],
+                         list(cards[-1][:2]))
+        for seat, player in enumerate(record[RECORDER_PLAYERS_KEY]
+                                            .values()):
+            seat_hands = game[game['seat'] == seat]
+            first = player[RECORDER_PLAYER_HAND_KEY][0]
+            self.assertEqual(1 if first == 'A' else first,
+                             hand_cards(seat_hands)[0][0])
+            self.assertEqual(player[RECORDER_PLAYER_BANKROLL_KEY],
+                             seat_hands['bankroll'][-1])
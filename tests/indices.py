@@ -0,0 +1,61 @@
+"""
+index generator tests
+"""
+
+# system imports
+import unittest
+import os
+import json
+import random
+
+# project imports
+from sim21.config import Config
+from sim21.counts import COUNT_HILO
+from sim21.indices import IndexCell, main
+from sim21.strategies.chart import load_chart, CHART_BASIC
+from sim21.strategies.deviation import load_deviations, DEVIATIONS_KEY
+
+
+class IndexTests(unittest.TestCase):
+
+    config_dir = os.path.join(os.path.dirname(__file__), 'configs')
+    output = 'indices.json'
+
+    def tearDown(self):
+        if os.path.exists(self.output):
+            os.remove(self.output)
+
+    def _index(self, deviation, trials=30000):
+        config = Config(os.path.join(self.config_dir, 'single_player.json'))
+        cell = IndexCell(config, load_chart(CHART_BASIC), COUNT_HILO,
+                         deviation)
+        cell.run(trials, random.Random(21))
+        self.assertEqual(trials, sum(cell.hands))
+        return cell.index()
+
+    def test_stand(self):
+        above, index = self._index({'hand': 'hard', 'total': 16,
+                                    'upcard': 10, 'action': 'stand',
+                                    'above': 0})
+        self.assertTrue(above)
+        self.assertLessEqual(abs(index), 2)
+
+    def test_hit(self):
+        above, index = self._index({'hand': 'hard', 'total': 12,
+                                    'upcard': 4, 'action': 'hit',
+                                    'below': 0})
+        self.assertFalse(above)
+        self.assertLessEqual(abs(index), 2)
+
+    def test_output(self):
+        result = main(['sim21-indices', '-q', '--seed', '21', '-n', '500',
+                       '-j', '2', '-d', 'fab4', '-o', self.output,
+                       os.path.join(self.config_dir, 'single_player.json')])
+        self.assertEqual(0, result)
+        with open(self.output) as f:
+            deviations = json.load(f)[DEVIATIONS_KEY]
+        for deviation in deviations:
+            self.assertIn(deviation['action'], ('surrender', 'nosurrender'))
+            self.assertTrue('above' in deviation or 'below' in deviation)
+        # the output is itself a deviation file
+        load_deviations((self.output,))
@@ -0,0 +1,45 @@
+"""
+paired simulation tests
+"""
+
+# system imports
+import unittest
+import os
+import json
+
+# project imports
+from sim21 import main
+
+
+class PairedTests(unittest.TestCase):
+
+    config_dir = os.path.join(os.path.dirname(__file__), 'configs')
+    stats_file = 'stats.json'
+
+    def tearDown(self):
+        if os.path.exists(self.stats_file):
+            os.remove(self.stats_file)
+
+    def _run(self, *options):
+        result = main(['sim21', '-q', '-p', '--seed', '21', '-n', '100']
+                      + list(options)
+                      + ['4', os.path.join(self.config_dir,
+                                           'multi_player.json'),
+                         self.stats_file])
+        self.assertEqual(0, result)
+        with open(self.stats_file) as f:
+            return json.load(f)
+
+    def test_same_cards(self):
+        stats = self._run()
+        basic = stats['sim21.strategies.betting.ConstantBettingStrategy:'
+                      'sim21.strategies.basic.Basic']
+        chart = stats['sim21.strategies.betting.ConstantBettingStrategy:'
+                      'sim21.strategies.chart.Chart']
+        self.assertEqual(basic, chart)
+        paired = stats['paired']
+        self.assertEqual(paired['basic - simple'], paired['chart - simple'])
+        self.assertGreater(paired['basic - simple']['games'], 0)
+
+    def test_jobs(self):
+        self.assertEqual(self._run(), self._run('-j', '2'))
@@ -0,0 +1,69 @@
+"""
+parallel simulation tests
+"""
+
+# system imports
+import unittest
+import os
+import json
+
+# project imports
+from sim21 import main, driver
+from sim21.recorder import RECORDER_INDEX_SUFFIX, RECORDER_GAME_KEY, \
+    read_games, read_game, write_all
+
+
+class ParallelTests(unittest.TestCase):
+
+    config_dir = os.path.join(os.path.dirname(__file__), 'configs')
+    stats_file = 'stats.json'
+    rfile = 'records.ndjson.gz'
+    nsim = 4
+
+    def tearDown(self):
+        for path in (self.stats_file, self.rfile,
+                     self.rfile + RECORDER_INDEX_SUFFIX):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_jobs(self, *options):
+        result = main(['sim21', '-q', '-j', '2', '-n', '10', '-r', self.rfile]
+                      + list(options)
+                      + [str(self.nsim),
+                         os.path.join(self.config_dir, 'single_player.json'),
+                         self.stats_file])
+        self.assertEqual(0, result)
+        with open(self.stats_file) as f:
+            stats = list(json.load(f).values())[0]
+        self.assertEqual(stats['games'] + stats['splits'],
+                         stats['wins'] + stats['loses'] + stats['pushes'])
+        games = 0
+        for i in range(self.nsim):
+            records = list(read_games(self.rfile, i))
+            self.assertEqual(list(range(len(records))),
+                             [r[RECORDER_GAME_KEY] for r in records])
+            self.assertEqual(records[-1],
+                             read_game(self.rfile, i, len(records) - 1))
+            games += len(records)
+        self.assertEqual(stats['games'], games)
+
+    def test_threads(self):
+        # threads are only used without a GIL; pretend, so they run here
+        gil_enabled = driver._gil_enabled
+        driver._gil_enabled = lambda: False
+        try:
+            self.test_jobs('--threads')
+        finally:
+            driver._gil_enabled = gil_enabled
+
+    def test_write_all(self):
+        # writes of at most 3 bytes at a time still write every byte
+        write = os.write
+        os.write = lambda fd, data: write(fd, data[:3])
+        try:
+            with open(self.rfile, 'wb') as f:
+                write_all(f.fileno(), b'0123456789')
+        finally:
+            os.write = write
+        with open(self.rfile, 'rb') as f:
+            self.assertEqual(b'0123456789', f.read())
@@ -0,0 +1,68 @@
+"""
+recorded card replay tests
+"""
+
+# system imports
+import unittest
+import os
+import json
+
+# project imports
+from sim21 import main
+from sim21.recorder import RECORDER_INDEX_SUFFIX, RECORDER_PLAYERS_KEY, \
+    RECORDER_PLAYER_WAGER_KEY, RECORDER_PLAYER_HAND_KEY, \
+    RECORDER_PLAYER_ACTION_KEY, read_games
+from sim21.replay import _game_cards
+
+
+class ReplayTests(unittest.TestCase):
+
+    config_dir = os.path.join(os.path.dirname(__file__), 'configs')
+    stats_file = 'stats.json'
+    rfile = 'records.ndjson'
+
+    def tearDown(self):
+        for path in (self.stats_file, self.rfile,
+                     self.rfile + RECORDER_INDEX_SUFFIX):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _run(self, config, *options):
+        result = main(['sim21', '-q', '--seed', '21', '-n', '200']
+                      + list(options)
+                      + ['3', os.path.join(self.config_dir, config),
+                         self.stats_file])
+        self.assertEqual(0, result)
+        with open(self.stats_file) as f:
+            return json.load(f)
+
+    def test_same_strategies(self):
+        for config in ('multi_player.json', 'split_unlimited.json',
+                       'surrender_late.json', 'counting.json',
+                       'wonging.json'):
+            with self.subTest(config=config):
+                recorded = self._run(config, '-r', self.rfile)
+                self.assertEqual(recorded,
+                                 self._run(config, '--replay', self.rfile))
+                self.assertEqual(recorded,
+                                 self._run(config, '--replay', self.rfile,
+                                           '-j', '2'))
+
+    def test_new_strategies(self):
+        self._run('multi_player.json', '-r', self.rfile)
+        stats = self._run('das.json', '--replay', self.rfile)
+        self.assertGreater(stats['sim21.strategies.betting.'
+                                 'ConstantBettingStrategy:'
+                                 'sim21.strategies.basic.Basic']['games'], 0)
+
+    def test_sit_out(self):
+        # a seat recorded with a 0 wager is not dealt to
+        self._run('wonging.json', '-r', self.rfile)
+        game = next(read_games(self.rfile, 0))
+        cards = _game_cards(game)
+        game[RECORDER_PLAYERS_KEY] = dict(
+            out={RECORDER_PLAYER_WAGER_KEY: 0,
+                 RECORDER_PLAYER_HAND_KEY: [],
+                 RECORDER_PLAYER_ACTION_KEY: {}},
+            **game[RECORDER_PLAYERS_KEY])
+        self.assertEqual(cards, _game_cards(game))
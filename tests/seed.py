@@ -0,0 +1,85 @@
+"""
+seeded simulation tests
+"""
+
+# system imports
+import threading
+import unittest
+import os
+import json
+
+# project imports
+from sim21 import main
+from sim21.config import Config
+from sim21.game import Game
+from sim21.recorder import RECORDER_SEED_KEY, RECORDER_SIMULATION_KEY, \
+    RECORDER_INDEX_SUFFIX, read_games
+
+
+class SeedTests(unittest.TestCase):
+
+    config_dir = os.path.join(os.path.dirname(__file__), 'configs')
+    stats_file = 'stats.json'
+    rfile = 'records.ndjson'
+    seed = 21
+
+    def tearDown(self):
+        for path in (self.stats_file, self.rfile,
+                     self.rfile + RECORDER_INDEX_SUFFIX):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _run(self, nsim, *options):
+        result = main(['sim21', '-q', '--seed', str(self.seed), '-n', '50']
+                      + list(options)
+                      + [str(nsim),
+                         os.path.join(self.config_dir, 'das.json'),
+                         self.stats_file])
+        self.assertEqual(0, result)
+        with open(self.stats_file) as f:
+            return json.load(f)
+
+    def _records(self, index):
+        return list(read_games(self.rfile, index))
+
+    def test_reproducible(self):
+        self.assertEqual(self._run(4), self._run(4))
+
+    def test_jobs(self):
+        self.assertEqual(self._run(4), self._run(4, '-j', '2'))
+
+    def test_replay(self):
+        self._run(3, '-r', self.rfile)
+        records = self._records(2)
+        self.assertEqual(self.seed, records[0][RECORDER_SEED_KEY])
+        self.assertEqual(2, records[0][RECORDER_SIMULATION_KEY])
+        self._run(1, '-r', self.rfile, '--first', '2')
+        self.assertEqual(records, self._records(2))
+
+    def _game_stats(self, game, ngame=50):
+        game.play(ngame)
+        return [(int(p.bankroll), vars(p.stats)) for p in game.players]
+
+    def test_reset(self):
+        config = Config(os.path.join(self.config_dir, 'split_unlimited.json'))
+        game = Game(None, config, self.seed, 0)
+        self._game_stats(game)
+        game.reset(1)
+        fresh = Game(None, config, self.seed, 1)
+        self.assertEqual(self._game_stats(fresh), self._game_stats(game))
+
+    def test_concurrent(self):
+        configs = [Config(os.path.join(self.config_dir, name))
+                   for name in ('multi_player.json', 'surrender_late.json')]
+        serial = [self._game_stats(Game(None, c, self.seed, 0), 1000)
+                  for c in configs]
+        games = [Game(None, c, self.seed, 0) for c in configs]
+        threads = [threading.Thread(target=g.play, args=(1000,))
+                   for g in games]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(serial,
+                         [[(int(p.bankroll), vars(p.stats))
+                           for p in g.players] for g in games])
@@ -5,12 +5,8 @@ Sequence cards in shoe for testing.
 # system imports
 import random
 
-# project imports
-from sim21.shoe import Card
-
 # global variables
 _sequences = None
-_game = None
 
 # constants
 PLAYERS_KEY = 'players'
@@ -20,9 +16,6 @@ DEALER_KEY = 'dealer'
 def sequencer(indices):
     if _sequences is None:
         raise RuntimeError("sequences not set")
-    global _game
-    from sim21.strategies.globals import g_game
-    _game = g_game
     index = 0
     for sim in _sequences:
         for sequence in sim[PLAYERS_KEY]:
@@ -63,9 +56,8 @@ def _get_value(test_card):
 
 def _get_index(index, value, indices):
     delta = 0
-    for i in indices[index:]:
-        if _game.shoe.decks[i // Card.nvalues] \
-                     .cards[i % Card.nvalues].value == value:
+    for card in indices[index:]:
+        if card == value:
             return index + delta
         else:
             delta += 1
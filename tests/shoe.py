@@ -0,0 +1,103 @@
+"""
+shoe tests
+"""
+
+# system imports
+import collections
+import os
+import random
+import unittest
+
+# project imports
+from sim21.config import Config
+from sim21.counts import COUNT_HILO, COUNT_SYSTEMS
+from sim21.game import Game
+from sim21.shoe import Shoe, Rank, ACE, card
+
+
+class ShoeTests(unittest.TestCase):
+
+    def test_composition(self):
+        shoe = Shoe(6, random.Random(0))
+        shoe.shuffle()
+        counts = collections.Counter(shoe.next() for _ in range(shoe.ncards))
+        self.assertEqual({v: 24 for v in range(ACE, 10)},
+                         {v: counts[v] for v in range(ACE, 10)})
+        self.assertEqual(96, counts[10])
+        self.assertEqual(1.0, shoe.position())
+
+    def test_lazy(self):
+        rng = random.Random(0)
+        shoe = Shoe(1, rng)
+        shoe.shuffle()
+        dealt = [shoe.next() for _ in range(10)]
+        self.assertEqual(dealt, list(shoe.cards[:10]))
+        # cards dealt again are not drawn again
+        state = rng.getstate()
+        shoe.pointer = 4
+        self.assertEqual(dealt[4:], [shoe.next() for _ in range(6)])
+        self.assertEqual(state, rng.getstate())
+        shoe.next()
+        self.assertNotEqual(state, rng.getstate())
+
+    def test_csm(self):
+        config = Config(os.path.join(os.path.dirname(__file__), 'configs',
+                                     'csm.json'))
+        self.assertEqual(0.0, config.reshuffle)
+        game = Game(None, config, 21)
+        counts = game.shoe.observe()
+        game.play(1)
+        for _ in range(10):
+            game.play_round()
+            self.assertLess(0, game.shoe.pointer)
+            # every round is dealt from a full shoe
+            game._shuffle()
+            self.assertEqual(0, game.shoe.pointer)
+            self.assertEqual(game.shoe.ncards, counts.unseen)
+
+    def test_card(self):
+        self.assertIs(Rank.Ace, card(ACE).rank)
+        for value in range(2, 11):
+            self.assertEqual(value, card(value).value)
+
+    def test_unobserved(self):
+        shoe = Shoe(1, random.Random(0))
+        self.assertIsNone(shoe.counts)
+        self.assertNotIn('next', vars(shoe))
+
+    def test_counts(self):
+        shoe = Shoe(2, random.Random(0))
+        counts = shoe.observe()
+        counts.add_system(COUNT_HILO)
+        shoe.shuffle()
+        dealt = [shoe.next() for _ in range(30)]
+        composition = collections.Counter(dealt)
+        self.assertEqual(74, counts.unseen)
+        for value in range(ACE, 11):
+            self.assertEqual((32 if value == 10 else 8) - composition[value],
+                             counts.remaining[value])
+        tags = COUNT_SYSTEMS[COUNT_HILO]
+        running = sum(tags[v] for v in dealt)
+        self.assertEqual(running, counts.running[COUNT_HILO])
+        self.assertAlmostEqual(running * 52 / 74,
+                               counts.true_count(COUNT_HILO))
+        counts.add_system('late', tags)
+        self.assertEqual(running, counts.running['late'])
+        shoe.shuffle()
+        self.assertEqual(104, counts.unseen)
+        self.assertEqual(0, counts.running[COUNT_HILO])
+
+    def test_hole_card(self):
+        config_dir = os.path.join(os.path.dirname(__file__), 'configs')
+        config = Config(os.path.join(config_dir, 'single_player.json'))
+        game = Game(None, config, 21)
+        seen = []
+        game.shoe.observe().subscribe(seen.append)
+        game.shoe.shuffle()
+        del seen[:]
+        game.play_round()
+        dealt = list(game.shoe.cards[:game.shoe.pointer])
+        # the hole card follows the player's second card and is seen last
+        self.assertEqual(dealt[:3] + dealt[4:] + dealt[3:4], seen)
+        self.assertEqual(game.shoe.ncards - game.shoe.pointer,
+                         game.shoe.counts.unseen)
@@ -29,3 +29,39 @@ class StatsTests(unittest.TestCase):
         finally:
             if os.path.exists(self.stats_file):
                 os.remove(self.stats_file)
+
+    def test_confidence_interval(self):
+        try:
+            result = main(['sim21', '-q', '-n', '100', '2',
+                           os.path.join(self.config_dir, 'single_player.json'),
+                           self.stats_file])
+            self.assertEqual(0, result)
+            with open(self.stats_file) as f:
+                stats = list(json.load(f).values())[0]
+            mean = stats['outcome'] / stats['games']
+            low, high = stats['outcome_ci']
+            self.assertLess(low, mean)
+            self.assertGreater(high, mean)
+            self.assertAlmostEqual(mean, (low + high) / 2)
+            self.assertGreater(stats['outcome_se'], 0)
+            self.assertGreater(stats['hand_outcome_se'], 0)
+        finally:
+            if os.path.exists(self.stats_file):
+                os.remove(self.stats_file)
+
+    def test_target_precision(self):
+        try:
+            # seeded, as an unlucky first batch can already be precise
+            result = main(['sim21', '-q', '--seed', '21', '-n', '10', '-t',
+                           '5', '1',
+                           os.path.join(self.config_dir, 'single_player.json'),
+                           self.stats_file])
+            self.assertEqual(0, result)
+            with open(self.stats_file) as f:
+                stats = list(json.load(f).values())[0]
+            self.assertGreater(stats['games'], 10)
+            low, high = stats['outcome_ci']
+            self.assertLess(high - low, 10)
+        finally:
+            if os.path.exists(self.stats_file):
+                os.remove(self.stats_file)
@@ -0,0 +1,43 @@
+"""
+phase timing tests
+"""
+
+# system imports
+import unittest
+import os
+import json
+import pstats
+
+# project imports
+from sim21 import main
+
+
+class TimingTests(unittest.TestCase):
+
+    config_dir = os.path.join(os.path.dirname(__file__), 'configs')
+    stats_file = 'stats.json'
+    pstats_file = 'sim21.pstats'
+
+    def tearDown(self):
+        for path in (self.stats_file, self.pstats_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _run(self, *options):
+        result = main(['sim21', '-q', '--seed', '21', '-n', '200']
+                      + list(options)
+                      + ['2', os.path.join(self.config_dir,
+                                           'multi_player.json'),
+                         self.stats_file])
+        self.assertEqual(0, result)
+        with open(self.stats_file) as f:
+            return json.load(f)
+
+    def test_unchanged(self):
+        self.assertEqual(self._run(), self._run('--profile'))
+        self.assertEqual(self._run('-p'), self._run('-p', '--profile'))
+
+    def test_pstats(self):
+        self._run('--pstats', self.pstats_file)
+        functions = [f[2] for f in pstats.Stats(self.pstats_file).stats]
+        self.assertIn('_player_hands', functions)